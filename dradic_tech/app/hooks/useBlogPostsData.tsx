@@ -35,7 +35,7 @@ function useBlogPostsData({ reloadTrigger }: { reloadTrigger: number }) {
 
   // Get or create the promise
   if (!blogPostsCache.has(cacheKey)) {
-    const promise = fetchBlogPosts();
+    const promise = fetchBlogPosts({ fresh: reloadTrigger > 0 });
     blogPostsCache.set(cacheKey, promise);
   }
 
@@ -8,6 +8,13 @@ import type {
 const API_BASE_URL =
   import.meta.env.VITE_API_BASE_URL || "http://localhost:8000";
 
+// Public URL of the static blog bundle the backend publishes to the bucket
+// (blog_static/). When set, public blog reads skip the API.
+const BLOG_STATIC_URL = import.meta.env.VITE_BLOG_STATIC_URL?.replace(
+  /\/$/,
+  "",
+);
+
 class ApiError extends Error {
   constructor(
     message: string,
@@ -79,6 +86,58 @@ async function apiRequest<T>(
   }
 }
 
+interface StaticBlogPointer {
+  index: string;
+  posts: Record<string, { etag: string; url: string }>;
+}
+
+interface StaticBlogIndex {
+  posts: { metadata: BlogPostMetadata; url: string }[];
+  total_count: number;
+}
+
+async function staticRequest<T>(path: string): Promise<T> {
+  const response = await fetch(`${BLOG_STATIC_URL}/${path}`);
+  if (!response.ok) {
+    throw new ApiError(
+      `HTTP ${response.status}: ${response.statusText}`,
+      response.status,
+    );
+  }
+  return await response.json();
+}
+
+// latest.json is short-lived and points at immutable, content-hashed files
+async function fetchStaticPointer(): Promise<StaticBlogPointer> {
+  return staticRequest<StaticBlogPointer>("latest.json");
+}
+
+async function fetchStaticIndex(): Promise<StaticBlogIndex> {
+  const pointer = await fetchStaticPointer();
+  return staticRequest<StaticBlogIndex>(pointer.index);
+}
+
+// Public blog post, from the static bundle when configured
+export async function fetchPublishedPostContent(
+  slug: string,
+): Promise<BlogPostWithSeparatedContent> {
+  if (BLOG_STATIC_URL) {
+    try {
+      const pointer = await fetchStaticPointer();
+      const entry = pointer.posts[slug];
+      if (entry) {
+        return await staticRequest<BlogPostWithSeparatedContent>(entry.url);
+      }
+    } catch (error) {
+      console.warn(
+        `Static blog bundle unavailable for ${slug}, using API:`,
+        error,
+      );
+    }
+  }
+  return fetchPostContent(slug);
+}
+
 export async function fetchPostContent(
   slug: string,
 ): Promise<BlogPostWithSeparatedContent> {
@@ -93,9 +152,24 @@ export async function fetchPostContent(
   }
 }
 
-export async function fetchBlogPosts(): Promise<
-  BlogPostWithSeparatedContent[]
-> {
+export async function fetchBlogPosts({
+  fresh = false,
+}: { fresh?: boolean } = {}): Promise<BlogPostWithSeparatedContent[]> {
+  // The static bundle is republished shortly after edits; callers that just
+  // made one ask for fresh data from the API
+  if (BLOG_STATIC_URL && !fresh) {
+    try {
+      const index = await fetchStaticIndex();
+      return await Promise.all(
+        index.posts.map((post) =>
+          staticRequest<BlogPostWithSeparatedContent>(post.url),
+        ),
+      );
+    } catch (error) {
+      console.warn("Static blog bundle unavailable, using API:", error);
+    }
+  }
+
   try {
     const response: {
       posts: BlogPostWithSeparatedContent[];
@@ -110,6 +184,15 @@ export async function fetchBlogPosts(): Promise<
 }
 
 export async function fetchPostsMetadata(): Promise<BlogPostMetadata[]> {
+  if (BLOG_STATIC_URL) {
+    try {
+      const index = await fetchStaticIndex();
+      return index.posts.map((post) => post.metadata);
+    } catch (error) {
+      console.warn("Static blog bundle unavailable, using API:", error);
+    }
+  }
+
   try {
     const metadata: BlogPostMetadata[] = await apiRequest(
       "/api/blog/posts-metadata",
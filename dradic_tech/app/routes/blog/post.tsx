@@ -1,5 +1,5 @@
 import { useLocation } from "react-router";
-import { fetchPostContent } from "~/modules/apis";
+import { fetchPublishedPostContent } from "~/modules/apis";
 import type { Route } from "./+types/post";
 import { MarkdownRenderer } from "~/components/markdown";
 import { useEffect, useState } from "react";
@@ -55,8 +55,8 @@ export default function Post({ params }: Route.ComponentProps) {
             };
           }
         } else {
-          // Fetch content from API
-          post = await fetchPostContent(params.slug);
+          // Fetch content from the static bundle, or the API
+          post = await fetchPublishedPostContent(params.slug);
         }
 
         if (!post || !post.content) {
@@ -11,6 +11,7 @@ import type { ReactNode } from "react";
 import type { User as SupabaseUser } from "@supabase/supabase-js";
 import { supabase } from "../modules/supabase";
 import { usersApi } from "~/modules/apis";
+import { clearBootstrap } from "~/modules/bootstrap";
 
 // Cache for user data to prevent redundant API calls
 const userCache = new Map<string, User>();
@@ -299,6 +300,7 @@ export function useAuthStore() {
 
       // Clear user cache on logout
       userCache.clear();
+      clearBootstrap();
       isInitialized.current = false;
     } catch (error) {
       console.error("Error signing out:", error);
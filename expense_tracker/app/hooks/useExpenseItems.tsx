@@ -1,6 +1,7 @@
 import { useState, useEffect, useRef } from "react";
 import { useAuth } from "~/contexts/AuthContext";
 import { expenseItemsApi } from "~/modules/apis";
+import { takeBootstrap } from "~/modules/bootstrap";
 import type { ExpenseItemResponse } from "~/modules/types";
 
 // Manual cache to prevent duplicate calls
@@ -39,6 +40,16 @@ function useExpenseItems({ reloadTrigger }: { reloadTrigger: number }) {
           setData(expenseItemsCache.get(cacheKey)!);
           return;
         }
+        const bootstrap = await takeBootstrap(userId, "expense_items");
+        if (bootstrap) {
+          const response = {
+            items: bootstrap.expense_items,
+            total_count: bootstrap.expense_items.length,
+          };
+          expenseItemsCache.set(cacheKey, response);
+          setData(response);
+          return;
+        }
       } else if (!shouldReload) {
         // Not first load and no reload needed
         return;
@@ -1,6 +1,7 @@
 import { use, useRef } from "react";
 import { useAuth } from "~/contexts/AuthContext";
 import { dashboardApi } from "~/modules/apis";
+import { takeBootstrap } from "~/modules/bootstrap";
 import type {
   DashboardDataWithExpenses,
   ExpenseWithDetails,
@@ -39,37 +40,46 @@ function useExpensesData({
   // Get or create the promise
   if (!expensesCache.has(cacheKey)) {
     const promise = userId
-      ? dashboardApi.getMonthlyDashboard(year, month, currency).then((res) => {
-          const data = res as DashboardDataWithExpenses;
-          const expenses = (data.expenses ?? []).map(
-            (row: ExpenseWithDetails) => ({
-              id: row.id,
-              item_name: row.item_name,
-              item_category: row.item_category,
-              item_is_fixed: row.item_is_fixed,
-              user_name: row.user_name,
-              user_email: row.user_email,
-              group_name: row.group_name,
-              item_id: row.item_id,
-              date: row.date,
-              amount: row.amount,
-              currency: row.currency,
-              created_at: row.created_at,
-            }),
-          );
-          return {
-            year: data.year,
-            month: data.month,
-            currency: data.currency,
-            cards: data.cards,
-            donut_graph: data.donut_graph,
-            table: data.table,
-            total_expenses: data.total_expenses,
-            total_income: data.total_income,
-            total_savings: data.total_savings,
-            expenses,
-          };
-        })
+      ? takeBootstrap(userId, "dashboard")
+          .then((bootstrap) =>
+            bootstrap &&
+            bootstrap.dashboard.year === year &&
+            bootstrap.dashboard.month === month &&
+            bootstrap.dashboard.currency === currency
+              ? bootstrap.dashboard
+              : dashboardApi.getMonthlyDashboard(year, month, currency),
+          )
+          .then((res) => {
+            const data = res as DashboardDataWithExpenses;
+            const expenses = (data.expenses ?? []).map(
+              (row: ExpenseWithDetails) => ({
+                id: row.id,
+                item_name: row.item_name,
+                item_category: row.item_category,
+                item_is_fixed: row.item_is_fixed,
+                user_name: row.user_name,
+                user_email: row.user_email,
+                group_name: row.group_name,
+                item_id: row.item_id,
+                date: row.date,
+                amount: row.amount,
+                currency: row.currency,
+                created_at: row.created_at,
+              }),
+            );
+            return {
+              year: data.year,
+              month: data.month,
+              currency: data.currency,
+              cards: data.cards,
+              donut_graph: data.donut_graph,
+              table: data.table,
+              total_expenses: data.total_expenses,
+              total_income: data.total_income,
+              total_savings: data.total_savings,
+              expenses,
+            };
+          })
       : Promise.resolve({
           year,
           month,
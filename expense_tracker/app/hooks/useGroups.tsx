@@ -1,6 +1,7 @@
 import { useState, useEffect, useRef } from "react";
 import { useAuth } from "~/contexts/AuthContext";
 import { groupsApi } from "~/modules/apis";
+import { takeBootstrap } from "~/modules/bootstrap";
 import type { Group } from "~/modules/types";
 
 // Manual cache to prevent duplicate calls
@@ -36,6 +37,12 @@ function useGroups({ reloadTrigger }: { reloadTrigger: number }) {
           setData(groupsCache.get(cacheKey)!);
           return;
         }
+        const bootstrap = await takeBootstrap(userId, "groups");
+        if (bootstrap) {
+          groupsCache.set(cacheKey, bootstrap.groups);
+          setData(bootstrap.groups);
+          return;
+        }
       } else if (!shouldReload) {
         // Not first load and no reload needed
         return;
@@ -1,6 +1,7 @@
 import { useState, useEffect, useRef } from "react";
 import { useAuth } from "~/contexts/AuthContext";
 import { incomeSourcesApi } from "~/modules/apis";
+import { takeBootstrap } from "~/modules/bootstrap";
 import type { IncomeSourceResponse } from "~/modules/types";
 
 // Manual cache to prevent duplicate calls
@@ -39,6 +40,16 @@ function useIncomeSources({ reloadTrigger }: { reloadTrigger: number }) {
           setData(incomeSourcesCache.get(cacheKey)!);
           return;
         }
+        const bootstrap = await takeBootstrap(userId, "income_sources");
+        if (bootstrap) {
+          const response = {
+            sources: bootstrap.income_sources,
+            total_count: bootstrap.income_sources.length,
+          };
+          incomeSourcesCache.set(cacheKey, response);
+          setData(response);
+          return;
+        }
       } else if (!shouldReload) {
         // Not first load and no reload needed
         return;
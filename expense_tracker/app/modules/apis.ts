@@ -2,6 +2,7 @@
 import { supabase } from "./supabase";
 import type {
   DashboardData,
+  DashboardRangeData,
   DashboardTableWithIncomes,
   Expense,
   ExpenseCreate,
@@ -10,6 +11,7 @@ import type {
   ExpenseItemResponse,
   ExpenseItemWithUser,
   ExpenseResponse,
+  ExpenseTrackerBootstrap,
   ExpenseWithDetails,
   Group,
   GroupCreate,
@@ -437,6 +439,35 @@ export const dashboardApi = {
       `/api/expense-tracker/incomes/dashboard/monthly/${year}/${month}/table?${params}`,
     );
   },
+
+  // Get per-month cards and category totals for a range of months (YYYY-MM)
+  getRangeDashboard: (
+    from: string,
+    to: string,
+    currency = "CLP",
+  ): Promise<DashboardRangeData> => {
+    const params = new URLSearchParams({ from, to, currency });
+    return apiRequest(
+      `/api/expense-tracker/expenses/dashboard/range?${params.toString()}`,
+    );
+  },
+};
+
+// Bootstrap API - initial-load data in one request. The response carries an
+// ETag with no-cache, so the browser revalidates and reuses it on a 304.
+export const bootstrapApi = {
+  get: (
+    year: number,
+    month: number,
+    currency = "CLP",
+  ): Promise<ExpenseTrackerBootstrap> => {
+    const params = new URLSearchParams({
+      year: year.toString(),
+      month: month.toString(),
+      currency,
+    });
+    return apiRequest(`/api/expense-tracker/bootstrap?${params.toString()}`);
+  },
 };
 
 // Health check
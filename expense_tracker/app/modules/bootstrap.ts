@@ -0,0 +1,43 @@
+import { bootstrapApi } from "./apis";
+import type { ExpenseTrackerBootstrap } from "./types";
+
+// One bootstrap request per user, shared by the data hooks on first load
+const bootstrapRequests = new Map<
+  string,
+  Promise<ExpenseTrackerBootstrap | null>
+>();
+const consumedParts = new Set<string>();
+
+export function startBootstrap(userId: string, currency = "CLP") {
+  if (bootstrapRequests.has(userId)) return;
+
+  const now = new Date();
+  bootstrapRequests.set(
+    userId,
+    bootstrapApi
+      .get(now.getFullYear(), now.getMonth() + 1, currency)
+      .catch((error) => {
+        console.warn("Bootstrap failed, loading data separately:", error);
+        return null;
+      }),
+  );
+}
+
+// Resolves with the bootstrap payload the first time a part is asked for.
+// Later calls (reloads after edits) resolve null so callers fetch fresh data.
+export function takeBootstrap(
+  userId: string,
+  part: string,
+): Promise<ExpenseTrackerBootstrap | null> {
+  const key = `${userId}:${part}`;
+  const request = bootstrapRequests.get(userId);
+  if (!request || consumedParts.has(key)) return Promise.resolve(null);
+
+  consumedParts.add(key);
+  return request;
+}
+
+export function clearBootstrap() {
+  bootstrapRequests.clear();
+  consumedParts.clear();
+}
@@ -227,3 +227,35 @@ export interface DashboardTableWithIncomes {
   table: DashboardTable;
   incomes: IncomeWithDetails[];
 }
+
+export interface DashboardMonthSummary {
+  year: number;
+  month: number;
+  cards: DashboardCard[];
+  categories: DashboardDonutData[];
+  total_expenses: number;
+  total_income: number;
+  total_savings: number;
+}
+
+export interface DashboardRangeData {
+  currency: string;
+  from_month: string;
+  to_month: string;
+  months: DashboardMonthSummary[];
+  categories: DashboardDonutData[];
+  total_expenses: number;
+  total_income: number;
+  total_savings: number;
+}
+
+// Everything the app needs on its initial load, from one request
+export interface ExpenseTrackerBootstrap {
+  expense_items: ExpenseItemWithUser[];
+  income_sources: IncomeSourceWithUser[];
+  expense_categories: string[];
+  income_categories: string[];
+  currencies: string[];
+  groups: Group[];
+  dashboard: DashboardDataWithExpenses;
+}
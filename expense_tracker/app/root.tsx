@@ -11,6 +11,7 @@ import {
 import { ThemeProvider } from "./contexts/ThemeContext";
 import { AuthProvider, useAuth } from "./contexts/AuthContext";
 import { Layout } from "./components/Layout";
+import { startBootstrap } from "./modules/bootstrap";
 
 import type { Route } from "./+types/root";
 import "./app.css";
@@ -60,9 +61,14 @@ export function RootLayout({ children }: { children: React.ReactNode }) {
 }
 
 function AppContent() {
-  const { isAuthenticated, isLoading } = useAuth();
+  const { isAuthenticated, isLoading, user } = useAuth();
   const location = useLocation();
 
+  // Start the initial-load request before the pages' data hooks mount
+  if (isAuthenticated && user) {
+    startBootstrap(user.id);
+  }
+
   // Public routes that don't require authentication
   const publicRoutes = ["/login", "/404"];
   const isPublicRoute = publicRoutes.includes(location.pathname);
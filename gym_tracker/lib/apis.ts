@@ -1,12 +1,16 @@
 // API Client for Gym Tracker
 import { supabase } from "./supabase";
 import type {
+  BatchResponse,
+  BatchSubRequest,
   Exercise,
   ExerciseCreate,
   GymActivity,
   GymActivityCreate,
   GymActivityResponse,
+  GymDailyStats,
   GymDashboardStats,
+  PersonalRecordResponse,
 } from "./types";
 
 const API_BASE_URL =
@@ -167,6 +171,41 @@ export const gymActivitiesApi = {
   // Get dashboard stats
   getDashboardStats: (): Promise<GymDashboardStats> =>
     apiRequest("/api/gym-tracker/activities/dashboard/stats"),
+
+  // Get per-day totals (default: the last year, at most 366 days)
+  getDailyStats: (params: {
+    start_date?: string;
+    end_date?: string;
+  } = {}): Promise<GymDailyStats[]> => {
+    const searchParams = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined) {
+        searchParams.append(key, value);
+      }
+    });
+    const queryString = searchParams.toString();
+    return apiRequest(
+      `/api/gym-tracker/activities/dashboard/daily${queryString ? `?${queryString}` : ""}`
+    );
+  },
+};
+
+// Personal Records API
+export const personalRecordsApi = {
+  // Get the best weight, estimated 1RM and set volume for every exercise
+  getAll: (): Promise<PersonalRecordResponse> =>
+    apiRequest("/api/gym-tracker/records/"),
+};
+
+// Batch API - one round trip for several calls. Consecutive GETs run
+// concurrently on the server; writes run in order and stop at the first
+// failure. Each result has its own status instead of throwing.
+export const batchApi = {
+  run: (requests: BatchSubRequest[]): Promise<BatchResponse> =>
+    apiRequest("/api/batch", {
+      method: "POST",
+      body: JSON.stringify({ requests }),
+    }),
 };
 
 // Export the ApiError class for error handling
@@ -176,6 +215,8 @@ export { ApiError };
 const api = {
   exercises: exercisesApi,
   activities: gymActivitiesApi,
+  records: personalRecordsApi,
+  batch: batchApi,
 };
 
 export default api;
@@ -54,3 +54,53 @@ export interface GymDashboardStats {
   activities_by_date: Record<string, number>;
   muscle_groups_distribution: Record<string, number>;
 }
+
+export interface GymDailyStats {
+  day: string; // YYYY-MM-DD
+  activities: number;
+  sets: number;
+  reps: number; // sets * reps
+  tonnage: number; // sets * reps * weight
+  muscle_volume: Record<string, number>;
+}
+
+export interface PersonalRecord {
+  exercise_id: string;
+  exercise_name: string;
+  best_weight: number;
+  best_weight_reps: number;
+  best_weight_activity_id: string;
+  best_weight_at: string;
+  best_one_rep_max: number; // Estimated: Brzycki up to 10 reps, Epley above
+  best_one_rep_max_activity_id: string;
+  best_one_rep_max_at: string;
+  best_set_volume: number; // reps * weight of a single set
+  best_set_volume_activity_id: string;
+  best_set_volume_at: string;
+  updated_at: string;
+}
+
+export interface PersonalRecordResponse {
+  records: PersonalRecord[];
+  total_count: number;
+}
+
+// Batch API: several API calls in one request
+export interface BatchSubRequest {
+  id?: string;
+  method?: "GET" | "POST" | "PUT" | "PATCH" | "DELETE";
+  path: string;
+  body?: unknown;
+  headers?: Record<string, string>;
+}
+
+export interface BatchSubResponse<T = unknown> {
+  id: string | null;
+  status: number;
+  headers: Record<string, string>;
+  body: T;
+}
+
+export interface BatchResponse {
+  responses: BatchSubResponse[];
+}
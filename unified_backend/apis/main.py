@@ -1,15 +1,26 @@
 import logging
 import os
+import re
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Any, Optional
 
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import (
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.security import HTTPBearer
 
+from routers.batch import batch_router
 from routers.blog import blog_router
 from routers.expense_tracker import (
+    analytics,
+    bootstrap,
     expense_items,
     expenses,
     groups,
@@ -17,23 +28,60 @@ from routers.expense_tracker import (
     incomes,
     users,
 )
-from routers.gym_tracker import exercises, gym_activity
+from routers.gym_tracker import exercises, gym_activity, personal_records
 
-from utils.auth import get_credentials_from_token
-from utils.supabase_service import SupabaseService
+from utils.auth import (
+    PREAUTHENTICATED_USER_SCOPE_KEY,
+    get_credentials_from_token,
+    get_current_user,
+)
+from utils.db import warm_up_pool
+from utils.storage import ByteRange, InvalidRange, PreconditionFailed
+from utils.supabase_service import FILE_STREAM_CHUNK_SIZE, supabase_service
+from utils.warmup import STARTUP_WARMUP, run_warmup, warmup_state
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the worker before it accepts requests"""
+    if STARTUP_WARMUP:
+        await run_warmup(
+            [
+                [
+                    ("database", warm_up_pool),
+                    (
+                        "exercise_catalog",
+                        lambda: len(exercises.load_exercise_catalog()),
+                    ),
+                ],
+                [
+                    ("supabase_service", supabase_service.initialize),
+                    ("blog_index", supabase_service.warm_up_blog),
+                ],
+            ]
+        )
+    else:
+        warmup_state.ready = True
+    yield
+
+
 app = FastAPI(
     title="Dradic Technologies API",
     description="Unified API for all Dradic Technologies projects",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 DRADIC_ENV = os.getenv("DRADIC__ENV", "DEV")
 
+# Default delivery for /api/files: "proxy" streams through this worker,
+# "redirect" sends clients to a presigned storage URL
+FILE_DELIVERY_MODE = os.getenv("FILE_DELIVERY_MODE", "proxy").lower()
+
 allowed_origins = [
     "https://expense-tracker-kappa-livid.vercel.app",
     "https://dradic-technologies.vercel.app",
@@ -56,7 +104,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # "*" is not a wildcard for credentialed requests; the blog editor reads
+    # ETag to send If-Match on updates
+    expose_headers=["*", "ETag"],
 )
 
 # Security scheme
@@ -77,6 +127,7 @@ OPTIONAL_AUTH_PATHS = {
     "/api/blog/posts",
     "/api/blog/posts-metadata",
     "/api/blog/posts-separated",
+    "/api/blog/search",
 }
 
 
@@ -140,8 +191,11 @@ async def get_current_user_global(request: Request) -> Optional[dict]:
 async def auth_middleware(request: Request, call_next):
     """Middleware to handle authentication globally"""
     try:
-        # Get current user (this will raise HTTPException if auth fails)
-        user = await get_current_user_global(request)
+        # Get current user (this will raise HTTPException if auth fails).
+        # Batch sub-requests reuse the user verified for the batch.
+        user = request.scope.get(PREAUTHENTICATED_USER_SCOPE_KEY)
+        if user is None:
+            user = await get_current_user_global(request)
 
         # Store user info in request state for use in endpoints
         request.state.current_user = user
@@ -191,6 +245,29 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now(timezone.utc)}
 
 
+# Storage latency counters, under /api/ so they need a signed-in user
+current_user_dependency = Depends(get_current_user)
+
+
+@app.get("/api/health/storage")
+async def storage_health(current_user: dict = current_user_dependency):
+    """Per-operation S3 latency counters for this worker"""
+    return {
+        "timestamp": datetime.now(timezone.utc),
+        "operations": supabase_service.get_storage_metrics(),
+    }
+
+
+# Readiness, flipped once the startup warmup has run
+@app.get("/health/ready")
+async def readiness():
+    """Whether this worker finished warming up, with per-phase timings"""
+    return JSONResponse(
+        status_code=200 if warmup_state.ready else 503,
+        content=warmup_state.as_dict(),
+    )
+
+
 # Ping endpoint for pre-warming
 @app.head("/ping")
 async def ping():
@@ -198,69 +275,151 @@ async def ping():
     return {"message": "pong", "timestamp": datetime.now(timezone.utc)}
 
 
+def parse_range_header(range_header: Optional[str]) -> Optional[ByteRange]:
+    """Return the (start, end) offsets of a single HTTP byte range, or None.
+
+    Multi-range and malformed headers are ignored so the full file is served.
+    """
+    if not range_header:
+        return None
+
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if start and end and int(end) < int(start):
+        return None
+
+    return (int(start) if start else None, int(end) if end else None)
+
+
+def parse_if_range_header(if_range: Optional[str]) -> dict:
+    """Map an If-Range validator onto storage GET preconditions"""
+    if not if_range:
+        return {}
+
+    # Weak validators never match for If-Range
+    if if_range.startswith("W/"):
+        return {"if_match": '"never-matches"'}
+    if if_range.startswith('"'):
+        return {"if_match": if_range}
+
+    try:
+        since = parsedate_to_datetime(if_range)
+    except (TypeError, ValueError):
+        return {"if_match": '"never-matches"'}
+    # A -0000 zone parses as naive; backends compare with aware times
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return {"if_unmodified_since": since}
+
+
+def iter_object_body(body: Any):
+    """Yield an object body in fixed-size chunks and close it afterwards"""
+    try:
+        yield from body.iter_chunks(FILE_STREAM_CHUNK_SIZE)
+    finally:
+        body.close()
+
+
 # Generic file download endpoint
 @app.get("/api/files")
 async def download_file(
+    request: Request,
     filename: str = Query(..., description="Filename to search for"),
+    mode: Optional[str] = Query(
+        None,
+        pattern="^(proxy|redirect)$",
+        description="proxy streams the file, redirect returns a 302 to a presigned URL",
+    ),
+    disposition: str = Query(
+        "attachment",
+        pattern="^(attachment|inline)$",
+        description="Use inline for images embedded in pages",
+    ),
 ):
-    """Download a file directly from the dradic-technologies bucket"""
+    """Stream a file from the dradic-technologies bucket, honouring Range requests"""
     try:
-        supabase_service = SupabaseService()
-        supabase_service.initialize()
-
-        # List all files in the dradic-technologies bucket
-        if supabase_service._s3_client:
-            # Use S3 API
-            response = supabase_service._s3_client.list_objects_v2(
-                Bucket="dradic-technologies"
+        # Resolve the filename against the cached key index of the shared service
+        selected_file = supabase_service.find_file(filename)
+        if not selected_file:
+            raise HTTPException(
+                status_code=404, detail=f"No files found matching '{filename}'"
             )
 
-            if "Contents" not in response:
-                raise HTTPException(status_code=404, detail="No files found in bucket")
-
-            # Find files that match the filename pattern
-            matching_files = []
-            for obj in response["Contents"]:
-                if filename.lower() in obj["Key"].lower():
-                    matching_files.append(
-                        {
-                            "key": obj["Key"],
-                            "size": obj["Size"],
-                            "last_modified": obj["LastModified"].isoformat(),
-                        }
-                    )
-
-            if not matching_files:
-                raise HTTPException(
-                    status_code=404, detail=f"No files found matching '{filename}'"
-                )
-
-            # Get the first matching file
-            selected_file = matching_files[0]
-
-            # Download the file content from S3
-            file_obj = supabase_service._s3_client.get_object(
-                Bucket="dradic-technologies", Key=selected_file["key"]
+        file_name = selected_file["key"].split("/")[-1]
+        content_disposition = f"{disposition}; filename={file_name}"
+
+        # Hand the transfer off to storage with a short-lived presigned URL,
+        # proxying instead when the storage backend cannot presign
+        presigned = None
+        if (mode or FILE_DELIVERY_MODE) == "redirect":
+            presigned = supabase_service.get_presigned_url(
+                selected_file["key"], content_disposition=content_disposition
+            )
+        if presigned:
+            url, usable_for = presigned
+            return RedirectResponse(
+                url,
+                status_code=302,
+                headers={"Cache-Control": f"private, max-age={int(usable_for)}"},
             )
 
-            file_content = file_obj["Body"].read()
-            file_name = selected_file["key"].split("/")[-1]
+        # Map Range / If-Range onto a ranged storage GET
+        byte_range = parse_range_header(request.headers.get("Range"))
+        conditions = (
+            parse_if_range_header(request.headers.get("If-Range")) if byte_range else {}
+        )
 
-            # Log the download for debugging
-            logger.info(
-                f"Downloading file: {selected_file['key']}, size: {len(file_content)} bytes"
+        try:
+            file_obj = supabase_service.get_object(
+                selected_file["key"], byte_range=byte_range, **conditions
             )
-
-            # Return the file directly
-            return Response(
-                content=file_content,
-                media_type="application/octet-stream",
-                headers={
-                    "Content-Disposition": f"attachment; filename={file_name}",
-                    "Content-Length": str(len(file_content)),
-                },
+        except PreconditionFailed:
+            # The file changed since the client cached it: send it all
+            file_obj = supabase_service.get_object(selected_file["key"])
+        except InvalidRange as e:
+            size = e.size if e.size is not None else selected_file["size"]
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{size}"},
+            ) from e
+
+        headers = {
+            "Content-Disposition": content_disposition,
+            "Content-Length": str(file_obj.content_length),
+            "Accept-Ranges": "bytes",
+        }
+        if file_obj.etag:
+            headers["ETag"] = file_obj.etag
+        if file_obj.last_modified:
+            headers["Last-Modified"] = format_datetime(
+                file_obj.last_modified, usegmt=True
             )
+        if file_obj.content_range:
+            headers["Content-Range"] = file_obj.content_range
+
+        # Log the download for debugging
+        logger.info(
+            f"Streaming file: {selected_file['key']}, "
+            f"range: {file_obj.content_range or 'full'}, "
+            f"size: {file_obj.content_length} bytes"
+        )
+
+        # Stream the body in chunks so memory stays flat regardless of size
+        return StreamingResponse(
+            iter_object_body(file_obj.body),
+            status_code=206 if file_obj.content_range else 200,
+            media_type="application/octet-stream",
+            headers=headers,
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to download file from bucket: {e}")
         raise HTTPException(
@@ -269,6 +428,11 @@ async def download_file(
 
 
 # Include routers
+app.include_router(
+    batch_router,
+    prefix="/api/batch",
+    tags=["Batch"],
+)
 app.include_router(
     blog_router,
     prefix="/api/blog",
@@ -294,6 +458,16 @@ app.include_router(
     prefix="/api/expense-tracker/expenses",
     tags=["Expense Tracker - Expenses"],
 )
+app.include_router(
+    bootstrap.bootstrap_router,
+    prefix="/api/expense-tracker/bootstrap",
+    tags=["Expense Tracker - Bootstrap"],
+)
+app.include_router(
+    analytics.analytics_router,
+    prefix="/api/expense-tracker/analytics",
+    tags=["Expense Tracker - Analytics"],
+)
 app.include_router(
     income_sources.income_sources_router,
     prefix="/api/expense-tracker/income-sources",
@@ -314,6 +488,11 @@ app.include_router(
     prefix="/api/gym-tracker/activities",
     tags=["Gym Tracker - Activities"],
 )
+app.include_router(
+    personal_records.personal_records_router,
+    prefix="/api/gym-tracker/records",
+    tags=["Gym Tracker - Personal Records"],
+)
 
 if __name__ == "__main__":
     import os
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr
@@ -256,6 +256,29 @@ class DashboardDataWithExpenses(DashboardData):
     expenses: List[ExpenseWithDetails]
 
 
+class DashboardMonthSummary(BaseModel):
+    year: int
+    month: int
+    cards: List[DashboardCard]
+    categories: List[DashboardDonutData]  # Every category, largest first
+    total_expenses: float
+    total_income: float
+    total_savings: float
+
+
+class DashboardRangeData(BaseModel):
+    """Per-month cards and category totals for a range of months"""
+
+    currency: str
+    from_month: str  # YYYY-MM
+    to_month: str
+    months: List[DashboardMonthSummary]
+    categories: List[DashboardDonutData]  # Totals over the whole range
+    total_expenses: float
+    total_income: float
+    total_savings: float
+
+
 class DashboardTableWithIncomes(BaseModel):
     """Dashboard table data that includes actual income objects for edit modal functionality"""
 
@@ -263,6 +286,60 @@ class DashboardTableWithIncomes(BaseModel):
     incomes: List[IncomeWithDetails]
 
 
+class ExpenseTrackerBootstrap(BaseModel):
+    """Everything the expense tracker needs on its initial load"""
+
+    expense_items: List[ExpenseItemWithUser]
+    income_sources: List[IncomeSourceWithUser]
+    expense_categories: List[str]
+    income_categories: List[str]
+    currencies: List[str]
+    groups: List[Group]
+    dashboard: DashboardDataWithExpenses
+
+
+# Analytics models for expense tracker
+class MonthlyTrend(BaseModel):
+    month: str  # YYYY-MM
+    expenses: float
+    income: float
+    savings: float
+    savings_rate: Optional[float] = None  # None for months without income
+    expenses_avg: float  # Rolling mean over the requested window
+    income_avg: float
+    expenses_yoy: Optional[float] = None  # Change vs. the same month last year
+    income_yoy: Optional[float] = None
+
+
+class WeeklyTrend(BaseModel):
+    week_start: date  # Monday
+    expenses: float
+    income: float
+    expenses_avg: float  # Rolling 4-week mean
+
+
+class CategoryTrend(BaseModel):
+    category: str
+    total: float
+    share: float  # Of total expenses in the range
+    monthly: List[float]  # Aligned with TrendsResponse.months
+    monthly_share: List[float]
+
+
+class TrendsResponse(BaseModel):
+    currency: str
+    start_month: str
+    end_month: str
+    window: int
+    total_expenses: float
+    total_income: float
+    total_savings: float
+    savings_rate: Optional[float] = None
+    months: List[MonthlyTrend]
+    weeks: List[WeeklyTrend]
+    categories: List[CategoryTrend]
+
+
 # Response Models for API
 class IncomeSourceResponse(BaseModel):
     sources: List[IncomeSourceWithUser]
@@ -287,6 +364,12 @@ class ExpenseResponse(BaseModel):
 
 
 # Blog Models
+class BlogHeading(BaseModel):
+    level: int
+    text: str
+    anchor: str
+
+
 class BlogPostMetadata(BaseModel):
     slug: str
     title: str
@@ -295,6 +378,10 @@ class BlogPostMetadata(BaseModel):
     image: Optional[str] = None
     category: Optional[str] = None
     author: Optional[str] = None
+    excerpt: Optional[str] = None  # Plain-text preview of the body
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None  # Minutes
+    outline: Optional[List[BlogHeading]] = None
 
     class Config:
         from_attributes = True
@@ -302,6 +389,7 @@ class BlogPostMetadata(BaseModel):
 
 class BlogPost(BlogPostMetadata):
     content: str
+    content_format: str = "markdown"  # "html" when rendered server-side
 
 
 class BlogPostCreate(BaseModel):
@@ -330,12 +418,14 @@ class BlogPostUpdate(BaseModel):
 class BlogPostResponse(BaseModel):
     posts: List[BlogPost]
     total_count: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 # New models for separated metadata and content
 class BlogPostWithSeparatedContent(BaseModel):
     metadata: BlogPostMetadata
-    content: str  # Pure markdown content without frontmatter
+    content: str  # Pure markdown content without frontmatter, or rendered HTML
+    content_format: str = "markdown"
 
     class Config:
         from_attributes = True
@@ -344,6 +434,44 @@ class BlogPostWithSeparatedContent(BaseModel):
 class BlogPostSeparatedResponse(BaseModel):
     posts: List[BlogPostWithSeparatedContent]
     total_count: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
+
+
+class BlogSearchResult(BaseModel):
+    metadata: BlogPostMetadata
+    score: float
+    title_highlighted: str  # HTML-escaped title with <mark> around matches
+    snippet: str  # HTML-escaped excerpt with <mark> around matches
+
+
+class BlogSearchResponse(BaseModel):
+    query: str
+    results: List[BlogSearchResult]
+    total_count: int
+
+
+# Batch Models
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None  # Echoed back to match results to requests
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str  # e.g. /api/gym-tracker/activities/?limit=20
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}  # Only If-Match and If-None-Match are forwarded
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
 
 
 # Auth Models
@@ -415,3 +543,33 @@ class GymDashboardStats(BaseModel):
     total_weight_lifted: Optional[float] = None
     activities_by_date: dict  # {"2026-01-01": 3, "2026-01-02": 2}
     muscle_groups_distribution: dict  # {"chest": 120, "back": 80}
+
+
+class GymDailyStats(BaseModel):
+    day: date
+    activities: int
+    sets: int
+    reps: int  # sets * reps, summed
+    tonnage: float  # sets * reps * weight, summed
+    muscle_volume: dict  # {"chest": 90.0, "triceps": 37.5}
+
+
+class PersonalRecord(BaseModel):
+    exercise_id: UUID
+    exercise_name: str
+    best_weight: float
+    best_weight_reps: float
+    best_weight_activity_id: UUID
+    best_weight_at: datetime
+    best_one_rep_max: float  # Estimated: Brzycki up to 10 reps, Epley above
+    best_one_rep_max_activity_id: UUID
+    best_one_rep_max_at: datetime
+    best_set_volume: float  # reps * weight of a single set
+    best_set_volume_activity_id: UUID
+    best_set_volume_at: datetime
+    updated_at: datetime
+
+
+class PersonalRecordResponse(BaseModel):
+    records: List[PersonalRecord]
+    total_count: int
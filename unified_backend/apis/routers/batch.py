@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from models import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from utils.auth import PREAUTHENTICATED_USER_SCOPE_KEY, get_current_user
+
+logger = logging.getLogger(__name__)
+
+batch_router = APIRouter()
+
+# Module-level singleton for dependency injection
+current_user_dependency = Depends(get_current_user)
+
+# Per-batch limits
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_BODY_BYTES = int(os.getenv("BATCH_MAX_BODY_BYTES", str(256 * 1024)))
+
+READ_METHODS = {"GET"}
+FORWARDED_HEADERS = {"if-match", "if-none-match"}
+RETURNED_HEADERS = {"etag", "location", "cache-control"}
+
+
+def validate_sub_request(sub: BatchSubRequest) -> str:
+    """Return why a sub-request can't be run, or an empty string"""
+    path = sub.path.split("?", 1)[0]
+    if not path.startswith("/api/"):
+        return "Only /api/ paths can be batched"
+    if path.rstrip("/") == "/api/batch":
+        return "Batches cannot be nested"
+    for name, value in sub.headers.items():
+        if name.lower() not in FORWARDED_HEADERS:
+            continue
+        # Forwarded as raw latin-1 header bytes
+        try:
+            value.encode("latin-1")
+        except UnicodeEncodeError:
+            return f"Header {name} must be latin-1 text"
+    return ""
+
+
+async def dispatch(
+    request: Request, sub: BatchSubRequest, user: Dict[str, Any]
+) -> BatchSubResponse:
+    """Run one sub-request through the app as the batch's user.
+
+    It goes through the same middleware and routes as a normal request, but
+    the auth middleware takes the user verified for the batch instead of
+    checking the token again.
+    """
+    path, _, query = sub.path.partition("?")
+    body = b"" if sub.body is None else json.dumps(sub.body).encode("utf-8")
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    ]
+    headers.extend(
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in sub.headers.items()
+        if name.lower() in FORWARDED_HEADERS
+    )
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": sub.method,
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "headers": headers,
+        PREAUTHENTICATED_USER_SCOPE_KEY: user,
+    }
+
+    body_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal body_sent
+        if body_sent:
+            # Like a client that stays connected until the response is done
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                name = name.decode("latin-1").lower()
+                if name in RETURNED_HEADERS or name == "content-type":
+                    response_headers[name] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception as e:
+        logger.error(f"Batch sub-request {sub.method} {sub.path} failed: {e}")
+        return BatchSubResponse(id=sub.id, status=500, body={"detail": str(e)})
+
+    content = b"".join(chunks)
+    content_type = response_headers.pop("content-type", "")
+    if not content:
+        result: Any = None
+    elif content_type.startswith("application/json"):
+        result = json.loads(content)
+    else:
+        result = content.decode("utf-8", errors="replace")
+    return BatchSubResponse(
+        id=sub.id, status=status, headers=response_headers, body=result
+    )
+
+
+def run_in_own_loop(request: Request, sub: BatchSubRequest, user: Dict[str, Any]):
+    # Route handlers make blocking database calls, so sub-requests only run
+    # concurrently when each gets a thread (and an event loop) of its own
+    return asyncio.run(dispatch(request, sub, user))
+
+
+@batch_router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    current_user: dict = current_user_dependency,
+):
+    """Run several API requests in one call.
+
+    Consecutive GETs run concurrently; every other method runs alone and in
+    order, after the requests before it and before the ones after it. When a
+    write fails, the requests after it are not run and get a 424.
+    """
+    if not batch.requests:
+        return BatchResponse(responses=[])
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch can hold at most {BATCH_MAX_REQUESTS} requests",
+        )
+    for sub in batch.requests:
+        if len(json.dumps(sub.body).encode("utf-8")) > BATCH_MAX_BODY_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Request bodies are limited to {BATCH_MAX_BODY_BYTES} bytes",
+            )
+
+    semaphore = asyncio.Semaphore(max(1, BATCH_MAX_CONCURRENCY))
+
+    async def run(sub: BatchSubRequest) -> BatchSubResponse:
+        problem = validate_sub_request(sub)
+        if problem:
+            return BatchSubResponse(id=sub.id, status=400, body={"detail": problem})
+        async with semaphore:
+            return await asyncio.to_thread(run_in_own_loop, request, sub, current_user)
+
+    # Split into groups: each run of consecutive reads, and each write alone
+    groups: List[List[BatchSubRequest]] = []
+    for sub in batch.requests:
+        if (
+            sub.method in READ_METHODS
+            and groups
+            and groups[-1][0].method in READ_METHODS
+        ):
+            groups[-1].append(sub)
+        else:
+            groups.append([sub])
+
+    responses: List[BatchSubResponse] = []
+    failed_write = False
+    for group in groups:
+        if failed_write:
+            responses.extend(
+                BatchSubResponse(
+                    id=sub.id,
+                    status=424,
+                    body={"detail": "Not run: an earlier write in the batch failed"},
+                )
+                for sub in group
+            )
+            continue
+
+        results = await asyncio.gather(*(run(sub) for sub in group))
+        responses.extend(results)
+        if group[0].method not in READ_METHODS and results[0].status >= 400:
+            failed_write = True
+
+    return BatchResponse(responses=responses)
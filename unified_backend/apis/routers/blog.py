@@ -1,9 +1,22 @@
+import base64
+import json
 import logging
 import re
 from datetime import datetime
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
 
 from models import (
@@ -16,15 +29,47 @@ from models import (
     BlogPostSeparatedResponse,
     BlogPostUpdate,
     BlogPostWithSeparatedContent,
+    BlogSearchResponse,
+    BlogSearchResult,
 )
 from utils.auth import get_current_user, get_current_user_optional
+from utils.blog_publish import publish_blog_bundle, public_metadata
+from utils.blog_summary import summarize_post, summary_frontmatter
+from utils.markdown_render import get_rendered_html
+from utils.storage import PreconditionFailed
 from utils.supabase_service import supabase_service
 
 blog_router = APIRouter()
 security = HTTPBearer()
+
+# ?format=html returns sanitized HTML rendered on the server instead of markdown
+content_format_query = Query(
+    "markdown",
+    alias="format",
+    pattern="^(markdown|html)$",
+    description="markdown returns the source, html returns sanitized rendered HTML",
+)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields that ?fields= can select on the list endpoints
+BLOG_METADATA_FIELDS = set(BlogPostMetadata.model_fields)
+BLOG_POST_FIELDS = set(BlogPost.model_fields)
+
+limit_query = Query(
+    None, ge=1, le=100, description="Page size; omit to return every post"
+)
+cursor_query = Query(None, description="next_cursor from the previous page")
+fields_query = Query(
+    None,
+    description="Comma-separated fields to return, e.g. slug,title,excerpt",
+)
+if_match_header = Header(
+    None,
+    alias="If-Match",
+    description="ETag of the version being edited; the update fails with 412 if the post changed since",
+)
+
 
 async def require_auth(request: Request) -> AuthUser:
     """Require authentication for protected endpoints and return AuthUser"""
@@ -71,35 +116,127 @@ def update_frontmatter_field(content: str, field: str, value: str) -> str:
     return f"---{updated_frontmatter}---{body}"
 
 
+def parse_fields(fields: Optional[str], allowed: Set[str]) -> Optional[Set[str]]:
+    """Parse a ?fields= selector, or return None to select everything"""
+    if not fields:
+        return None
+
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return selected
+
+
+def encode_cursor(created_at: str, slug: str) -> str:
+    """Encode the sort key of the last post on a page as an opaque cursor"""
+    raw = json.dumps([created_at, slug]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        created_at, slug = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), str(slug)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def paginate_posts(
+    posts: List[Any],
+    sort_key: Callable[[Any], Tuple[str, str]],
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of posts, newest created_at first, and the next cursor"""
+    posts = sorted(posts, key=sort_key, reverse=True)
+    if cursor:
+        after = decode_cursor(cursor)
+        posts = [post for post in posts if sort_key(post) < after]
+
+    if limit is None or len(posts) <= limit:
+        return posts, None
+
+    page = posts[:limit]
+    return page, encode_cursor(*sort_key(page[-1]))
+
+
+def etag_matches(if_match: str, etag: Optional[str]) -> bool:
+    """Check an If-Match header value against the current ETag of a post"""
+    candidates = [value.strip() for value in if_match.split(",")]
+    if "*" in candidates:
+        return True
+    return etag is not None and etag in candidates
+
+
+def build_post_metadata(slug: str, metadata: Dict[str, Any]) -> BlogPostMetadata:
+    """Build the API metadata of a post from its parsed frontmatter and summary"""
+    return BlogPostMetadata(**public_metadata(slug, metadata))
+
+
 @blog_router.get("/posts", response_model=BlogPostResponse)
 async def get_blog_posts(
+    limit: Optional[int] = limit_query,
+    cursor: Optional[str] = cursor_query,
+    fields: Optional[str] = fields_query,
     current_user: Optional[dict] = Depends(get_current_user_optional),
 ):
     """Get all blog posts with metadata (public endpoint)"""
     try:
-        post_slugs = supabase_service.list_blog_posts()
-        posts: List[BlogPost] = []
+        selected = parse_fields(fields, BLOG_POST_FIELDS)
+
+        # Page through the stored summaries; bodies are only fetched for the
+        # posts on the page, and only if content was asked for
+        summaries = [
+            build_post_metadata(summary["slug"], summary)
+            for summary in supabase_service.get_blog_post_summaries()
+        ]
+
+        total_count = len(summaries)
+        next_cursor = None
+        if limit or cursor:
+            summaries, next_cursor = paginate_posts(
+                summaries, lambda x: (x.created_at, x.slug), limit, cursor
+            )
+        else:
+            # Sort by updated_at (newest first)
+            summaries.sort(key=lambda x: x.updated_at, reverse=True)
 
-        for slug in post_slugs:
-            content = supabase_service.get_blog_post_content(slug)
-            if content:
-                metadata = supabase_service.parse_blog_post_metadata(content)
-
-                post = BlogPost(
-                    slug=slug,
-                    title=metadata.get("title", "Untitled"),
-                    created_at=metadata.get("created_at", datetime.now().isoformat()),
-                    updated_at=metadata.get("updated_at", datetime.now().isoformat()),
-                    image=metadata.get("image", ""),
-                    content=content,
+        posts: List[BlogPost] = []
+        if selected is None or "content" in selected:
+            cached_posts = supabase_service.get_blog_posts(
+                [summary.slug for summary in summaries]
+            )
+            contents = {post.slug: post.content for post in cached_posts}
+            for summary in summaries:
+                if summary.slug in contents:
+                    posts.append(
+                        BlogPost(**summary.dict(), content=contents[summary.slug])
+                    )
+        else:
+            posts = [BlogPost(**summary.dict(), content="") for summary in summaries]
+
+        if selected is not None:
+            return JSONResponse(
+                jsonable_encoder(
+                    {
+                        "posts": [post.dict(include=selected) for post in posts],
+                        "total_count": total_count,
+                        "next_cursor": next_cursor,
+                    }
                 )
-                posts.append(post)
-
-        # Sort by updated_at (newest first)
-        posts.sort(key=lambda x: x.updated_at, reverse=True)
+            )
 
-        return BlogPostResponse(posts=posts, total_count=len(posts))
+        return BlogPostResponse(
+            posts=posts, total_count=total_count, next_cursor=next_cursor
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch blog posts: {str(e)}"
@@ -108,23 +245,28 @@ async def get_blog_posts(
 
 @blog_router.get("/posts/{slug}", response_model=BlogPost)
 async def get_blog_post(
-    slug: str, current_user: Optional[dict] = Depends(get_current_user_optional)
+    slug: str,
+    response: Response,
+    content_format: str = content_format_query,
+    current_user: Optional[dict] = Depends(get_current_user_optional),
 ):
     """Get a specific blog post by slug (public endpoint)"""
     try:
-        content = supabase_service.get_blog_post_content(slug)
-        if not content:
+        cached_post = supabase_service.get_blog_post(slug)
+        if not cached_post:
             raise HTTPException(status_code=404, detail="Blog post not found")
 
-        metadata = supabase_service.parse_blog_post_metadata(content)
+        content = cached_post.content
+        if content_format == "html":
+            content = get_rendered_html(cached_post.body)
+        elif cached_post.etag:
+            # Editors send this back as If-Match when updating the post
+            response.headers["ETag"] = cached_post.etag
 
         return BlogPost(
-            slug=slug,
-            title=metadata.get("title", "Untitled"),
-            created_at=metadata.get("created_at", datetime.now().isoformat()),
-            updated_at=metadata.get("updated_at", datetime.now().isoformat()),
-            image=metadata.get("image", ""),
+            **build_post_metadata(slug, cached_post.metadata).dict(),
             content=content,
+            content_format=content_format,
         )
 
     except HTTPException:
@@ -137,7 +279,10 @@ async def get_blog_post(
 
 @blog_router.post("/posts", response_model=BlogPost)
 async def create_blog_post(
-    post_data: BlogPostCreate, user: AuthUser = Depends(require_auth)
+    post_data: BlogPostCreate,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user: AuthUser = Depends(require_auth),
 ):
     """Create a new blog post (requires authentication)"""
     try:
@@ -155,12 +300,14 @@ async def create_blog_post(
             )
 
         # Check if post already exists
-        existing_content = supabase_service.get_blog_post_content(post_data.slug)
-        if existing_content:
+        if supabase_service.head_blog_post(post_data.slug):
             raise HTTPException(
                 status_code=409, detail="Blog post with this slug already exists"
             )
 
+        # Precompute the preview fields list views serve without the body
+        summary = summarize_post(post_data.content)
+
         # Create frontmatter from metadata and assemble full content
         now = datetime.now().isoformat()
         frontmatter = f"""---
@@ -170,14 +317,30 @@ updated_at: {now}
 image: {post_data.image or ""}
 category: {post_data.category or ""}
 author: {post_data.author or ""}
+{summary_frontmatter(summary)}
 ---
 
 {post_data.content}"""
 
-        # Upload to Supabase
-        success = supabase_service.upload_blog_post(post_data.slug, frontmatter)
-        if not success:
+        # Upload to Supabase, unless someone created the same slug meanwhile
+        try:
+            etag = supabase_service.upload_blog_post(
+                post_data.slug, frontmatter, if_none_match="*"
+            )
+        except PreconditionFailed as e:
+            raise HTTPException(
+                status_code=409, detail="Blog post with this slug already exists"
+            ) from e
+        if etag is None:
             raise HTTPException(status_code=500, detail="Failed to create blog post")
+        if etag:
+            response.headers["ETag"] = etag
+
+        # Render the HTML now so readers never wait for it
+        get_rendered_html(supabase_service.strip_frontmatter(frontmatter))
+
+        # Rebuild the static copy of the blog once the response is sent
+        background_tasks.add_task(publish_blog_bundle)
 
         return BlogPost(
             slug=post_data.slug,
@@ -185,6 +348,9 @@ author: {post_data.author or ""}
             created_at=now,
             updated_at=now,
             image=post_data.image or "",
+            category=post_data.category or "",
+            author=post_data.author or "",
+            **summary,
             content=post_data.content,  # Return pure content
         )
 
@@ -198,7 +364,12 @@ author: {post_data.author or ""}
 
 @blog_router.put("/posts/{slug}", response_model=BlogPost)
 async def update_blog_post(
-    slug: str, post_data: BlogPostUpdate, user: AuthUser = Depends(require_auth)
+    slug: str,
+    post_data: BlogPostUpdate,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    if_match: Optional[str] = if_match_header,
+    user: AuthUser = Depends(require_auth),
 ):
     """Update an existing blog post (requires authentication)"""
     try:
@@ -208,13 +379,36 @@ async def update_blog_post(
                 status_code=403, detail="Insufficient permissions to update blog posts"
             )
 
-        # Check if post exists
-        existing_content = supabase_service.get_blog_post_content(slug)
-        if not existing_content:
-            raise HTTPException(status_code=404, detail="Blog post not found")
-
-        # Parse existing metadata
-        existing_metadata = supabase_service.parse_blog_post_metadata(existing_content)
+        # Read only what the update needs: the stored metadata when the body
+        # is replaced, the cached post (revalidated by ETag) when it is kept
+        existing_body = None
+        if post_data.content is None:
+            existing_post = supabase_service.get_blog_post(slug, revalidate=True)
+            if not existing_post:
+                raise HTTPException(status_code=404, detail="Blog post not found")
+            current_etag = existing_post.etag
+            existing_metadata = existing_post.metadata
+            existing_body = existing_post.body
+        else:
+            info = supabase_service.head_blog_post(slug)
+            if not info:
+                raise HTTPException(status_code=404, detail="Blog post not found")
+            current_etag = info.etag
+            summary_entry = supabase_service.get_blog_post_summary(slug)
+            if summary_entry and summary_entry["etag"] == current_etag:
+                existing_metadata = summary_entry["metadata"]
+            else:
+                existing_post = supabase_service.get_blog_post(slug, revalidate=True)
+                if not existing_post:
+                    raise HTTPException(status_code=404, detail="Blog post not found")
+                current_etag = existing_post.etag
+                existing_metadata = existing_post.metadata
+
+        if if_match and not etag_matches(if_match, current_etag):
+            raise HTTPException(
+                status_code=412,
+                detail="Blog post was modified since it was loaded; reload and retry",
+            )
 
         # Update metadata with new values
         now = datetime.now().isoformat()
@@ -239,12 +433,13 @@ async def update_blog_post(
             else existing_metadata.get("author", "")
         )
 
-        # Use new content or extract existing content without frontmatter
-        updated_content = post_data.content if post_data.content is not None else ""
-        if not updated_content and existing_content.startswith("---"):
-            end_index = existing_content.find("---", 3)
-            if end_index != -1:
-                updated_content = existing_content[end_index + 3 :].strip()
+        # Use new content or keep the existing content without frontmatter
+        updated_content = (
+            post_data.content if post_data.content is not None else existing_body
+        )
+
+        # Precompute the preview fields list views serve without the body
+        summary = summarize_post(updated_content)
 
         # Assemble new frontmatter
         frontmatter = f"""---
@@ -254,14 +449,31 @@ updated_at: {now}
 image: {updated_image}
 category: {updated_category}
 author: {updated_author}
+{summary_frontmatter(summary)}
 ---
 
 {updated_content}"""
 
-        # Upload to Supabase
-        success = supabase_service.upload_blog_post(slug, frontmatter)
-        if not success:
+        # Upload to Supabase, only over the version the update was based on
+        try:
+            etag = supabase_service.upload_blog_post(
+                slug, frontmatter, if_match=current_etag
+            )
+        except PreconditionFailed as e:
+            raise HTTPException(
+                status_code=412,
+                detail="Blog post was modified since it was loaded; reload and retry",
+            ) from e
+        if etag is None:
             raise HTTPException(status_code=500, detail="Failed to update blog post")
+        if etag:
+            response.headers["ETag"] = etag
+
+        # Render the HTML now so readers never wait for it
+        get_rendered_html(supabase_service.strip_frontmatter(frontmatter))
+
+        # Rebuild the static copy of the blog once the response is sent
+        background_tasks.add_task(publish_blog_bundle)
 
         return BlogPost(
             slug=slug,
@@ -269,6 +481,9 @@ author: {updated_author}
             created_at=existing_metadata.get("created_at", now),
             updated_at=now,
             image=updated_image,
+            category=updated_category,
+            author=updated_author,
+            **summary,
             content=updated_content,  # Return pure content
         )
 
@@ -281,7 +496,11 @@ author: {updated_author}
 
 
 @blog_router.delete("/posts/{slug}")
-async def delete_blog_post(slug: str, user: AuthUser = Depends(require_auth)):
+async def delete_blog_post(
+    slug: str,
+    background_tasks: BackgroundTasks,
+    user: AuthUser = Depends(require_auth),
+):
     """Delete a blog post (requires authentication)"""
     try:
         # Validate user permissions
@@ -291,8 +510,7 @@ async def delete_blog_post(slug: str, user: AuthUser = Depends(require_auth)):
             )
 
         # Check if post exists
-        existing_content = supabase_service.get_blog_post_content(slug)
-        if not existing_content:
+        if not supabase_service.head_blog_post(slug):
             raise HTTPException(status_code=404, detail="Blog post not found")
 
         # Delete from Supabase
@@ -300,6 +518,9 @@ async def delete_blog_post(slug: str, user: AuthUser = Depends(require_auth)):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete blog post")
 
+        # Rebuild the static copy of the blog once the response is sent
+        background_tasks.add_task(publish_blog_bundle)
+
         return {"message": f"Blog post '{slug}' deleted successfully"}
 
     except HTTPException:
@@ -334,24 +555,11 @@ async def get_blog_posts_metadata(
 ):
     """Get blog posts metadata only (without content) (public endpoint)"""
     try:
-        post_slugs = supabase_service.list_blog_posts()
-        posts_metadata: List[BlogPostMetadata] = []
-
-        for slug in post_slugs:
-            content = supabase_service.get_blog_post_content(slug)
-            if content:
-                metadata = supabase_service.parse_blog_post_metadata(content)
-
-                post_metadata = BlogPostMetadata(
-                    slug=slug,
-                    title=metadata.get("title", "Untitled"),
-                    created_at=metadata.get("created_at", datetime.now().isoformat()),
-                    updated_at=metadata.get("updated_at", datetime.now().isoformat()),
-                    image=metadata.get("image", ""),
-                    category=metadata.get("category", ""),
-                    author=metadata.get("author", ""),
-                )
-                posts_metadata.append(post_metadata)
+        # Served from the stored summaries, without downloading post bodies
+        posts_metadata: List[BlogPostMetadata] = [
+            build_post_metadata(summary["slug"], summary)
+            for summary in supabase_service.get_blog_post_summaries()
+        ]
 
         # Sort by updated_at (newest first)
         posts_metadata.sort(key=lambda x: x.updated_at, reverse=True)
@@ -365,44 +573,68 @@ async def get_blog_posts_metadata(
 
 
 @blog_router.get("/posts-separated", response_model=BlogPostSeparatedResponse)
-async def get_blog_posts_separated():
+async def get_blog_posts_separated(
+    limit: Optional[int] = limit_query,
+    cursor: Optional[str] = cursor_query,
+    fields: Optional[str] = fields_query,
+):
     """Get all blog posts with separated metadata and content (public endpoint)"""
     try:
-        post_slugs = supabase_service.list_blog_posts()
-        posts: List[BlogPostWithSeparatedContent] = []
-
-        for slug in post_slugs:
-            content = supabase_service.get_blog_post_content(slug)
-            if content:
-                metadata = supabase_service.parse_blog_post_metadata(content)
-                # Extract pure content without frontmatter
-                pure_content = content
-                if content.startswith("---"):
-                    end_index = content.find("---", 3)
-                    if end_index != -1:
-                        pure_content = content[end_index + 3 :].strip()
-
-                post_metadata = BlogPostMetadata(
-                    slug=slug,
-                    title=metadata.get("title", "Untitled"),
-                    created_at=metadata.get("created_at", datetime.now().isoformat()),
-                    updated_at=metadata.get("updated_at", datetime.now().isoformat()),
-                    image=metadata.get("image", ""),
-                    category=metadata.get("category", ""),
-                    author=metadata.get("author", ""),
-                )
+        selected = parse_fields(fields, BLOG_METADATA_FIELDS | {"content"})
+        include_content = selected is None or "content" in selected
+
+        summaries = [
+            build_post_metadata(summary["slug"], summary)
+            for summary in supabase_service.get_blog_post_summaries()
+        ]
+
+        # Sort by created_at (newest first), one page at a time if requested
+        total_count = len(summaries)
+        summaries, next_cursor = paginate_posts(
+            summaries, lambda x: (x.created_at, x.slug), limit, cursor
+        )
 
-                post = BlogPostWithSeparatedContent(
-                    metadata=post_metadata,
-                    content=pure_content,
-                )
-                posts.append(post)
+        # Bodies are only fetched for the posts on the page
+        bodies = {}
+        if include_content:
+            cached_posts = supabase_service.get_blog_posts(
+                [summary.slug for summary in summaries]
+            )
+            bodies = {post.slug: post.body for post in cached_posts}
 
-        # Sort by updated_at (newest first)
-        posts.sort(key=lambda x: x.metadata.created_at, reverse=True)
+        posts: List[BlogPostWithSeparatedContent] = [
+            BlogPostWithSeparatedContent(
+                metadata=summary, content=bodies.get(summary.slug, "")
+            )
+            for summary in summaries
+            if not include_content or summary.slug in bodies
+        ]
+
+        if selected is not None:
+            selected_metadata = selected - {"content"}
+            page = []
+            for post in posts:
+                item = {"metadata": post.metadata.dict(include=selected_metadata)}
+                if include_content:
+                    item["content"] = post.content
+                page.append(item)
+
+            return JSONResponse(
+                jsonable_encoder(
+                    {
+                        "posts": page,
+                        "total_count": total_count,
+                        "next_cursor": next_cursor,
+                    }
+                )
+            )
 
-        return BlogPostSeparatedResponse(posts=posts, total_count=len(posts))
+        return BlogPostSeparatedResponse(
+            posts=posts, total_count=total_count, next_cursor=next_cursor
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch blog posts: {str(e)}"
@@ -410,35 +642,28 @@ async def get_blog_posts_separated():
 
 
 @blog_router.get("/posts-separated/{slug}", response_model=BlogPostWithSeparatedContent)
-async def get_blog_post_separated(slug: str):
+async def get_blog_post_separated(
+    slug: str, response: Response, content_format: str = content_format_query
+):
     """Get a specific blog post by slug with separated metadata and content (public endpoint)"""
     try:
-        content = supabase_service.get_blog_post_content(slug)
-        if not content:
+        cached_post = supabase_service.get_blog_post(slug)
+        if not cached_post:
             raise HTTPException(status_code=404, detail="Blog post not found")
 
-        metadata = supabase_service.parse_blog_post_metadata(content)
-
-        # Extract pure content without frontmatter
-        pure_content = content
-        if content.startswith("---"):
-            end_index = content.find("---", 3)
-            if end_index != -1:
-                pure_content = content[end_index + 3 :].strip()
+        pure_content = cached_post.body
+        if content_format == "html":
+            pure_content = get_rendered_html(pure_content)
+        elif cached_post.etag:
+            # Editors send this back as If-Match when updating the post
+            response.headers["ETag"] = cached_post.etag
 
-        post_metadata = BlogPostMetadata(
-            slug=slug,
-            title=metadata.get("title", "Untitled"),
-            created_at=metadata.get("created_at", datetime.now().isoformat()),
-            updated_at=metadata.get("updated_at", datetime.now().isoformat()),
-            image=metadata.get("image", ""),
-            category=metadata.get("category", ""),
-            author=metadata.get("author", ""),
-        )
+        post_metadata = build_post_metadata(slug, cached_post.metadata)
 
         return BlogPostWithSeparatedContent(
             metadata=post_metadata,
             content=pure_content,
+            content_format=content_format,
         )
 
     except HTTPException:
@@ -447,3 +672,29 @@ async def get_blog_post_separated(slug: str):
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch blog post: {str(e)}"
         ) from e
+
+
+@blog_router.get("/search", response_model=BlogSearchResponse)
+async def search_blog_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Full-text search over blog posts with prefix matching (public endpoint)"""
+    try:
+        results = []
+        for match in supabase_service.search_blog_posts(q, limit):
+            results.append(
+                BlogSearchResult(
+                    metadata=build_post_metadata(match["slug"], match["metadata"]),
+                    score=match["score"],
+                    title_highlighted=match["title_highlighted"],
+                    snippet=match["snippet"],
+                )
+            )
+
+        return BlogSearchResponse(query=q, results=results, total_count=len(results))
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to search blog posts: {str(e)}"
+        ) from e
@@ -0,0 +1,45 @@
+import logging as logger
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from models import TrendsResponse
+from utils.auth import get_current_user
+from utils.spending_trends import get_trends
+
+analytics_router = APIRouter()
+
+# Module-level singleton for dependency injection
+current_user_dependency = Depends(get_current_user)
+
+months_query = Query(12, ge=1, le=120, description="Months to report, up to this one")
+window_query = Query(3, ge=1, le=12, description="Months in each rolling average")
+end_month_query = Query(
+    None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Last month, YYYY-MM"
+)
+
+
+@analytics_router.get("/trends", response_model=TrendsResponse)
+async def get_spending_trends(
+    currency: str = "CLP",
+    months: int = months_query,
+    window: int = window_query,
+    end_month: Optional[str] = end_month_query,
+    current_user: dict = current_user_dependency,
+):
+    """Get monthly, weekly and category trends with rolling averages and YoY changes"""
+    try:
+        end = None
+        if end_month:
+            year, month = map(int, end_month.split("-"))
+            end = date(year, month, 1)
+
+        return get_trends(current_user.get("uid"), currency, months, window, end)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch spending trends: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch spending trends: {str(e)}"
+        ) from e
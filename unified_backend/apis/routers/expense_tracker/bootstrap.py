@@ -0,0 +1,195 @@
+import hashlib
+import logging as logger
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+
+from models import (
+    ExpenseItemWithUser,
+    ExpenseTrackerBootstrap,
+    Group,
+    IncomeSourceWithUser,
+)
+from routers.expense_tracker.expenses import build_monthly_dashboard
+from utils.auth import get_current_user
+from utils.db import DatabaseModel
+
+bootstrap_router = APIRouter()
+
+# Module-level singleton for dependency injection
+current_user_dependency = Depends(get_current_user)
+
+year_query = Query(None, ge=1900, le=9999, description="Dashboard year; default: now")
+month_query = Query(None, ge=1, le=12, description="Dashboard month; default: now")
+if_none_match_header = Header(
+    None,
+    alias="If-None-Match",
+    description="ETag of a previous bootstrap; answered with 304 if nothing changed",
+)
+
+# Every initial-load read as one statement, so the whole payload costs a
+# single round trip on a single connection. Row sets come back as JSON.
+BOOTSTRAP_QUERY = """
+    SELECT
+        (
+            SELECT COALESCE(json_agg(items ORDER BY items.name), '[]'::json)
+            FROM (
+                SELECT
+                    ei.id, ei.name, ei.category, ei.is_fixed, ei.user_id,
+                    u.name as user_name, u.email as user_email
+                FROM dradic_tech.expense_items ei
+                JOIN dradic_tech.users u ON ei.user_id = u.id
+                WHERE ei.user_id = :user_id
+            ) items
+        ) AS expense_items,
+        (
+            SELECT COALESCE(json_agg(sources ORDER BY sources.name), '[]'::json)
+            FROM (
+                SELECT
+                    isc.id, isc.name, isc.category, isc.user_id, isc.created_at,
+                    isc.updated_at, u.name as user_name, u.email as user_email,
+                    isc.is_recurring
+                FROM dradic_tech.income_sources isc
+                JOIN dradic_tech.users u ON isc.user_id = u.id
+                WHERE isc.user_id = :user_id
+            ) sources
+        ) AS income_sources,
+        (
+            SELECT COALESCE(array_agg(DISTINCT category ORDER BY category), '{}')
+            FROM dradic_tech.expense_items
+            WHERE category IS NOT NULL AND category <> '' AND user_id = :user_id
+        ) AS expense_categories,
+        (
+            SELECT COALESCE(array_agg(DISTINCT category ORDER BY category), '{}')
+            FROM dradic_tech.income_sources
+            WHERE category IS NOT NULL AND category <> '' AND user_id = :user_id
+        ) AS income_categories,
+        (
+            SELECT COALESCE(array_agg(DISTINCT e.currency ORDER BY e.currency), '{}')
+            FROM dradic_tech.expenses e
+            JOIN dradic_tech.expense_items ei ON e.item_id = ei.id
+            WHERE ei.user_id = :user_id AND e.currency IS NOT NULL
+            AND e.currency <> ''
+        ) AS currencies,
+        (
+            SELECT COALESCE(json_agg(user_groups ORDER BY user_groups.name), '[]'::json)
+            FROM (
+                SELECT g.id, g.name, g.description, g.created_at
+                FROM dradic_tech.groups g
+                JOIN dradic_tech.users u ON g.id = u.group_id
+                WHERE u.id = :user_id
+            ) user_groups
+        ) AS groups,
+        (
+            SELECT COALESCE(
+                json_agg(month_expenses ORDER BY month_expenses.date DESC),
+                '[]'::json
+            )
+            FROM (
+                SELECT
+                    e.id,
+                    e.item_id,
+                    e.amount,
+                    e.currency,
+                    e.date,
+                    e.created_at,
+                    ei.name as item_name,
+                    ei.category as item_category,
+                    ei.is_fixed as item_is_fixed,
+                    u.name as user_name,
+                    u.email as user_email,
+                    NULL as group_name
+                FROM dradic_tech.expenses e
+                JOIN dradic_tech.expense_items ei ON e.item_id = ei.id
+                JOIN dradic_tech.users u ON ei.user_id = u.id
+                WHERE e.date >= :month_start
+                AND e.date < :month_end
+                AND e.currency = :currency
+                AND u.id = :user_id
+            ) month_expenses
+        ) AS month_expenses,
+        (
+            SELECT COALESCE(SUM(i.amount), 0)
+            FROM dradic_tech.incomes i
+            JOIN dradic_tech.income_sources ins ON i.source_id = ins.id
+            WHERE i.date >= :month_start
+            AND i.date < :month_end
+            AND i.currency = :currency
+            AND ins.user_id = :user_id
+        ) AS month_income
+"""
+
+
+def payload_etag(payload: ExpenseTrackerBootstrap) -> str:
+    """Strong ETag over the serialized payload"""
+    body = payload.model_dump_json().encode("utf-8")
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_in(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag"""
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@bootstrap_router.get("", response_model=ExpenseTrackerBootstrap)
+async def get_bootstrap(
+    response: Response,
+    year: Optional[int] = year_query,
+    month: Optional[int] = month_query,
+    currency: str = "CLP",
+    if_none_match: Optional[str] = if_none_match_header,
+    current_user: dict = current_user_dependency,
+):
+    """Get expense items, income sources, categories, currencies, groups and a month's dashboard in one call"""
+    try:
+        today = date.today()
+        year = year or today.year
+        month = month or today.month
+        month_start = date(year, month, 1)
+        month_end = date(year + month // 12, month % 12 + 1, 1)
+
+        params = {
+            "user_id": current_user.get("uid"),
+            "currency": currency,
+            "month_start": month_start,
+            "month_end": month_end,
+        }
+        row = DatabaseModel.execute_query(BOOTSTRAP_QUERY, params)[0]
+
+        payload = ExpenseTrackerBootstrap(
+            expense_items=[
+                ExpenseItemWithUser(**item) for item in row["expense_items"]
+            ],
+            income_sources=[
+                IncomeSourceWithUser(**source) for source in row["income_sources"]
+            ],
+            expense_categories=row["expense_categories"],
+            income_categories=row["income_categories"],
+            currencies=row["currencies"],
+            groups=[Group(**group) for group in row["groups"]],
+            dashboard=build_monthly_dashboard(
+                year,
+                month,
+                currency,
+                row["month_expenses"],
+                float(row["month_income"]),
+            ),
+        )
+
+        # Clients revalidate on every load and get a 304 while nothing changed
+        etag = payload_etag(payload)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if if_none_match and etag_in(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return payload
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch bootstrap data: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch bootstrap data: {str(e)}"
+        ) from e
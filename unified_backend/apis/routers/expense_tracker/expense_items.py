@@ -12,6 +12,7 @@ from models import (
 )
 from utils.auth import get_current_user
 from utils.db import DatabaseModel
+from utils.spending_trends import invalidate_user_analytics
 
 expense_items_router = APIRouter()
 
@@ -207,6 +208,8 @@ async def update_expense_item(
         if not updated_item:
             raise HTTPException(status_code=404, detail="Expense item not found")
 
+        # Category changes move this item's expenses between series
+        invalidate_user_analytics(current_user.get("uid"))
         return ExpenseItem(**updated_item)
     except HTTPException:
         raise
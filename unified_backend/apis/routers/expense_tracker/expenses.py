@@ -1,6 +1,6 @@
 import logging as logger
-from datetime import date, datetime
-from typing import Optional
+from datetime import MAXYEAR, MINYEAR, date, datetime
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -10,6 +10,8 @@ from models import (
     DashboardDataWithExpenses,
     DashboardDonutData,
     DashboardDonutGraph,
+    DashboardMonthSummary,
+    DashboardRangeData,
     DashboardTable,
     DashboardTableRow,
     Expense,
@@ -20,6 +22,7 @@ from models import (
 )
 from utils.auth import get_current_user
 from utils.db import DatabaseModel
+from utils.spending_trends import invalidate_user_analytics
 
 expenses_router = APIRouter()
 
@@ -51,6 +54,7 @@ async def create_expense(
 
         expense_data = expense.dict()
         new_expense = DatabaseModel.insert_record("expenses", expense_data)
+        invalidate_user_analytics(current_user.get("uid"))
         return Expense(**new_expense)
     except HTTPException:
         raise
@@ -121,16 +125,13 @@ async def get_expenses(
 
         # Get total count
         count_query = f"SELECT COUNT(*) as total FROM ({query}) as subquery"
-        total_count = DatabaseModel.execute_query(count_query, params)
-        total = total_count[0]["total"] if total_count else 0
+        count_params = dict(params)
 
         # Add ordering and pagination
         query += " ORDER BY e.date DESC, e.created_at DESC LIMIT :limit OFFSET :offset"
         params["limit"] = str(limit)
         params["offset"] = str(offset)
 
-        expenses = DatabaseModel.execute_query(query, params)
-
         # Calculate summary
         summary_query = """
             SELECT
@@ -161,7 +162,17 @@ async def get_expenses(
 
         summary_query += " GROUP BY e.currency"
 
-        summary_data = DatabaseModel.execute_query(summary_query, summary_params)
+        # Count, page and summary don't depend on each other
+        (
+            total_count,
+            expenses,
+            summary_data,
+        ) = await DatabaseModel.execute_queries_concurrently(
+            (count_query, count_params),
+            (query, params),
+            (summary_query, summary_params),
+        )
+        total = total_count[0]["total"] if total_count else 0
 
         # For simplicity, return the first currency's summary or defaults
         if summary_data:
@@ -286,6 +297,7 @@ async def update_expense(
         if not updated_expense:
             raise HTTPException(status_code=404, detail="Expense not found")
 
+        invalidate_user_analytics(current_user.get("uid"))
         return Expense(**updated_expense)
     except HTTPException:
         raise
@@ -325,6 +337,7 @@ async def delete_expense(
         if not deleted:
             raise HTTPException(status_code=404, detail="Expense not found")
 
+        invalidate_user_analytics(current_user.get("uid"))
         return {"message": "Expense deleted successfully"}
     except HTTPException:
         raise
@@ -359,6 +372,114 @@ async def get_currencies(current_user: dict = current_user_dependency):
         ) from e
 
 
+def build_month_cards(
+    total_income: float,
+    total_expenses: float,
+    currency: str,
+    previous_income: float = 0.0,
+    previous_expenses: float = 0.0,
+) -> List[DashboardCard]:
+    """Income, expenses and remaining cards for a month"""
+    return [
+        DashboardCard(
+            title="Total Income",
+            description="Total income for the month",
+            value=total_income,
+            currency=currency,
+            previous_value=previous_income,
+        ),
+        DashboardCard(
+            title="Total Expenses",
+            description="Total expenses for the month",
+            value=total_expenses,
+            currency=currency,
+            previous_value=previous_expenses,
+        ),
+        DashboardCard(
+            title="Remaining",
+            description="Remaining amount for the month",
+            value=total_income - total_expenses,
+            currency=currency,
+            previous_value=previous_income - previous_expenses,
+        ),
+    ]
+
+
+def build_monthly_dashboard(
+    year: int,
+    month: int,
+    currency: str,
+    expenses_data: List[dict],
+    total_income: float,
+) -> DashboardDataWithExpenses:
+    """Assemble a month's dashboard from its expense rows and income total"""
+    # Create full expense objects for edit modal
+    expenses = [ExpenseWithDetails(**expense) for expense in expenses_data]
+
+    # Calculate totals
+    total_expenses = sum(expense.amount for expense in expenses)
+    total_savings = total_income - total_expenses
+
+    # Create dashboard cards
+    cards = build_month_cards(total_income, total_expenses, currency)
+
+    # Create donut graph data (group expenses by category)
+    category_totals: dict[str, float] = {}
+    for expense in expenses:
+        category = expense.item_category or "Uncategorized"
+        category_totals[category] = category_totals.get(category, 0) + expense.amount
+
+    # Sort categories by amount and take only top 4
+    sorted_categories = sorted(
+        category_totals.items(), key=lambda x: x[1], reverse=True
+    )[:4]
+
+    donut_data = [
+        DashboardDonutData(label=cat, value=amount)
+        for cat, amount in sorted_categories
+        if amount > 0
+    ]
+
+    donut_graph = DashboardDonutGraph(
+        title="Expenses by category",
+        description="Top 4 expense categories",
+        data=donut_data,
+    )
+
+    # Create table data
+    table_rows = [
+        DashboardTableRow(
+            id=str(expense.id),
+            name=expense.item_name,
+            category=expense.item_category or "Uncategorized",
+            amount=f"{currency} {abs(expense.amount):,.0f}",
+            date=expense.date.strftime("%m/%d/%Y"),
+            description=expense.item_name,
+        )
+        for expense in expenses
+    ]
+
+    table = DashboardTable(
+        title=f"{datetime(year, month, 1).strftime('%B')}",
+        description="Click on an expense to edit it.",
+        columns=["Name", "Category", "Amount", "Date", "Description"],
+        data=table_rows,
+    )
+
+    return DashboardDataWithExpenses(
+        year=year,
+        month=month,
+        currency=currency,
+        cards=cards,
+        donut_graph=donut_graph,
+        table=table,
+        total_expenses=total_expenses,
+        total_income=total_income,
+        total_savings=total_savings,
+        expenses=expenses,
+    )
+
+
 @expenses_router.get(
     "/dashboard/monthly/{year}/{month}", response_model=DashboardDataWithExpenses
 )
@@ -429,101 +550,180 @@ async def get_monthly_dashboard(
             "user_id": user_id,
         }
 
-        expenses_data = DatabaseModel.execute_query(expenses_query, params)
-        income_data = DatabaseModel.execute_query(income_query, params)
+        expenses_data, income_data = await DatabaseModel.execute_queries_concurrently(
+            (expenses_query, params), (income_query, params)
+        )
 
-        # Calculate totals
-        total_expenses = sum(float(exp["amount"]) for exp in expenses_data)
         total_income = sum(float(inc["amount"]) for inc in income_data)
-        total_savings = total_income - total_expenses
-
-        # Create dashboard cards
-        cards = [
-            DashboardCard(
-                title="Total Income",
-                description="Total income for the month",
-                value=total_income,
-                currency=currency,
-            ),
-            DashboardCard(
-                title="Total Expenses",
-                description="Total expenses for the month",
-                value=total_expenses,
-                currency=currency,
-            ),
-            DashboardCard(
-                title="Remaining",
-                description="Remaining amount for the month",
-                value=total_savings,
-                currency=currency,
-            ),
-        ]
-
-        # Create donut graph data (group expenses by category)
-        category_totals: dict[str, float] = {}
-        for expense in expenses_data:
-            category = expense["item_category"] or "Uncategorized"
-            amount = float(expense["amount"])
-            category_totals[category] = category_totals.get(category, 0) + amount
-
-        # Sort categories by amount and take only top 4
-        sorted_categories = sorted(
-            category_totals.items(), key=lambda x: x[1], reverse=True
-        )[:4]
-
-        donut_data = [
-            DashboardDonutData(label=cat, value=amount)
-            for cat, amount in sorted_categories
-            if amount > 0
-        ]
-
-        donut_graph = DashboardDonutGraph(
-            title="Expenses by category",
-            description="Top 4 expense categories",
-            data=donut_data,
+
+        return build_monthly_dashboard(
+            year, month, currency, expenses_data, total_income
         )
 
-        # Create table data
-        table_rows = []
-        for expense in expenses_data:
-            table_rows.append(
-                DashboardTableRow(
-                    id=str(expense["id"]),
-                    name=expense["item_name"],
-                    category=expense["item_category"] or "Uncategorized",
-                    amount=f"{currency} {abs(float(expense['amount'])):,.0f}",
-                    date=expense["date"].strftime("%m/%d/%Y"),
-                    description=expense["item_name"],
-                )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch dashboard data: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch dashboard data: {str(e)}"
+        ) from e
+
+
+# Longest range served by the range dashboard
+DASHBOARD_RANGE_MAX_MONTHS = 120
+
+month_pattern = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def parse_month(value: str) -> Tuple[int, int]:
+    """Split a YYYY-MM string into (year, month)"""
+    year, month = value.split("-")
+    return int(year), int(month)
+
+
+@expenses_router.get("/dashboard/range", response_model=DashboardRangeData)
+async def get_range_dashboard(
+    from_month: str = Query(..., alias="from", pattern=month_pattern),
+    to_month: str = Query(..., alias="to", pattern=month_pattern),
+    currency: str = "CLP",
+    current_user: dict = current_user_dependency,
+):
+    """Get cards and category totals for every month from `from` to `to` in one query"""
+    try:
+        start_year, start_month = parse_month(from_month)
+        end_year, end_month = parse_month(to_month)
+        first = start_year * 12 + start_month - 1
+        last = end_year * 12 + end_month - 1
+
+        # The query reads from the month before `from` up to the month after
+        # `to`, and both must still be valid dates
+        if first - 1 < MINYEAR * 12 or last + 1 > MAXYEAR * 12 + 11:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Months must be between {MINYEAR:04d}-02 and {MAXYEAR}-11",
+            )
+        if last < first:
+            raise HTTPException(
+                status_code=400, detail="'to' must not be before 'from'"
+            )
+        if last - first + 1 > DASHBOARD_RANGE_MAX_MONTHS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Range cannot exceed {DASHBOARD_RANGE_MAX_MONTHS} months",
             )
 
-        table = DashboardTable(
-            title=f"{datetime(year, month, 1).strftime('%B')}",
-            description="Click on an expense to edit it.",
-            columns=["Name", "Category", "Amount", "Date", "Description"],
-            data=table_rows,
-        )
+        # Both tables grouped by month in one round trip. The month before the
+        # range is included so the first month's cards have previous values.
+        range_query = """
+            SELECT 'expense' AS kind, month, category, total
+            FROM (
+                SELECT
+                    date_trunc('month', e.date)::date AS month,
+                    COALESCE(ei.category, 'Uncategorized') AS category,
+                    SUM(e.amount) AS total
+                FROM dradic_tech.expenses e
+                JOIN dradic_tech.expense_items ei ON e.item_id = ei.id
+                WHERE ei.user_id = :user_id
+                AND e.currency = :currency
+                AND e.date >= :start_date
+                AND e.date < :end_date
+                GROUP BY 1, 2
+            ) monthly_expenses
+            UNION ALL
+            SELECT 'income' AS kind, month, NULL AS category, total
+            FROM (
+                SELECT
+                    date_trunc('month', i.date)::date AS month,
+                    SUM(i.amount) AS total
+                FROM dradic_tech.incomes i
+                JOIN dradic_tech.income_sources ins ON i.source_id = ins.id
+                WHERE ins.user_id = :user_id
+                AND i.currency = :currency
+                AND i.date >= :start_date
+                AND i.date < :end_date
+                GROUP BY 1
+            ) monthly_incomes
+        """
+
+        params = {
+            "user_id": current_user.get("uid"),
+            "currency": currency,
+            "start_date": date((first - 1) // 12, (first - 1) % 12 + 1, 1),
+            "end_date": date((last + 1) // 12, (last + 1) % 12 + 1, 1),
+        }
+        rows = DatabaseModel.execute_query(range_query, params)
+
+        # Index months from first - 1 (the lookback month) to last
+        month_count = last - first + 2
+        expenses_by_month = [0.0] * month_count
+        income_by_month = [0.0] * month_count
+        categories_by_month: List[Dict[str, float]] = [{} for _ in range(month_count)]
+        for row in rows:
+            index = row["month"].year * 12 + row["month"].month - 1 - (first - 1)
+            total = float(row["total"])
+            if row["kind"] == "income":
+                income_by_month[index] += total
+            else:
+                expenses_by_month[index] += total
+                categories_by_month[index][row["category"]] = total
+
+        months = []
+        range_categories: Dict[str, float] = {}
+        for index in range(1, month_count):
+            year, month = divmod(first + index - 1, 12)
+            total_expenses = expenses_by_month[index]
+            total_income = income_by_month[index]
+            for category, total in categories_by_month[index].items():
+                range_categories[category] = range_categories.get(category, 0) + total
+
+            months.append(
+                DashboardMonthSummary(
+                    year=year,
+                    month=month + 1,
+                    cards=build_month_cards(
+                        total_income,
+                        total_expenses,
+                        currency,
+                        previous_income=income_by_month[index - 1],
+                        previous_expenses=expenses_by_month[index - 1],
+                    ),
+                    categories=[
+                        DashboardDonutData(label=category, value=total)
+                        for category, total in sorted(
+                            categories_by_month[index].items(),
+                            key=lambda x: x[1],
+                            reverse=True,
+                        )
+                    ],
+                    total_expenses=total_expenses,
+                    total_income=total_income,
+                    total_savings=total_income - total_expenses,
+                )
+            )
 
-        # Create full expense objects for edit modal
-        expenses = [ExpenseWithDetails(**expense) for expense in expenses_data]
+        total_expenses = sum(month.total_expenses for month in months)
+        total_income = sum(month.total_income for month in months)
 
-        return DashboardDataWithExpenses(
-            year=year,
-            month=month,
+        return DashboardRangeData(
             currency=currency,
-            cards=cards,
-            donut_graph=donut_graph,
-            table=table,
+            from_month=from_month,
+            to_month=to_month,
+            months=months,
+            categories=[
+                DashboardDonutData(label=category, value=total)
+                for category, total in sorted(
+                    range_categories.items(), key=lambda x: x[1], reverse=True
+                )
+            ],
             total_expenses=total_expenses,
             total_income=total_income,
-            total_savings=total_savings,
-            expenses=expenses,
+            total_savings=total_income - total_expenses,
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to fetch dashboard data: {str(e)}")
+        logger.error(f"Failed to fetch range dashboard data: {str(e)}")
         raise HTTPException(
-            status_code=500, detail=f"Failed to fetch dashboard data: {str(e)}"
+            status_code=500, detail=f"Failed to fetch range dashboard data: {str(e)}"
         ) from e
@@ -16,6 +16,7 @@ from models import (
 )
 from utils.auth import get_current_user
 from utils.db import DatabaseModel
+from utils.spending_trends import invalidate_user_analytics
 
 incomes_router = APIRouter()
 
@@ -49,6 +50,7 @@ async def create_income(
         # Insert the income record
         income_data = income.dict()
         new_income = DatabaseModel.insert_record("incomes", income_data)
+        invalidate_user_analytics(current_user.get("uid"))
         return Income(**new_income)
     except HTTPException:
         raise
@@ -274,6 +276,7 @@ async def update_income(
         if not updated_income:
             raise HTTPException(status_code=404, detail="Income not found")
 
+        invalidate_user_analytics(current_user.get("uid"))
         return Income(**updated_income)
     except HTTPException:
         raise
@@ -313,6 +316,7 @@ async def delete_income(income_id: str, current_user: dict = current_user_depend
         if not deleted:
             raise HTTPException(status_code=404, detail="Income not found")
 
+        invalidate_user_analytics(current_user.get("uid"))
         return {"message": "Income deleted successfully"}
     except HTTPException:
         raise
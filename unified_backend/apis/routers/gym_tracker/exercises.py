@@ -1,18 +1,64 @@
 import logging as logger
-from typing import Optional
+import os
+import re
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from models import Exercise, ExerciseCreate
 from utils.auth import get_current_user
+from utils.cache import LRUCache
 from utils.db import DatabaseModel
+from utils.gym_daily_stats import refresh_gym_daily_stats_for_exercise
 
 exercises_router = APIRouter()
 
 # Module-level singleton for dependency injection
 current_user_dependency = Depends(get_current_user)
 
+# The exercise catalog is small and rarely changes, so each worker keeps the
+# whole list in memory and serves listings and searches from it. Writes through
+# this worker invalidate it; other workers pick changes up after the TTL.
+EXERCISE_CATALOG_TTL_SECONDS = float(os.getenv("EXERCISE_CATALOG_TTL_SECONDS", "300"))
+_catalog_cache = LRUCache(max_entries=1, ttl_seconds=EXERCISE_CATALOG_TTL_SECONDS)
+
+
+def load_exercise_catalog() -> List[Dict[str, Any]]:
+    """Return every exercise ordered by name, from memory when fresh"""
+    catalog = _catalog_cache.get("exercises")
+    if catalog is None:
+        catalog = DatabaseModel.execute_query(
+            """
+            SELECT id, name, muscles_trained, created_at, updated_at
+            FROM dradic_tech.exercises
+            ORDER BY name ASC
+            """
+        )
+        _catalog_cache.set("exercises", catalog)
+    return catalog
+
+
+def invalidate_exercise_catalog():
+    _catalog_cache.clear()
+
+
+def like_pattern(search: str) -> "re.Pattern[str]":
+    """Compile search with SQL LIKE semantics (% and _ wildcards, backslash
+    escapes the next character), matching anywhere in a casefolded name"""
+    parts = []
+    characters = iter(search.casefold())
+    for character in characters:
+        if character == "%":
+            parts.append(".*")
+        elif character == "_":
+            parts.append(".")
+        elif character == "\\":
+            parts.append(re.escape(next(characters, "\\")))
+        else:
+            parts.append(re.escape(character))
+    return re.compile("".join(parts), re.DOTALL)
+
 
 @exercises_router.post("/", response_model=Exercise)
 async def create_exercise(
@@ -34,6 +80,7 @@ async def create_exercise(
 
         exercise_data = exercise.dict()
         new_exercise = DatabaseModel.insert_record("exercises", exercise_data)
+        invalidate_exercise_catalog()
         return Exercise(**new_exercise)
     except HTTPException:
         raise
@@ -53,21 +100,18 @@ async def get_exercises(
 ):
     """Get all exercises (requires authentication)"""
     try:
-        query = """
-            SELECT id, name, muscles_trained, created_at, updated_at
-            FROM dradic_tech.exercises
-        """
-        params = {}
+        exercises = load_exercise_catalog()
 
         if search:
-            query += " WHERE LOWER(name) LIKE LOWER(:search)"
-            params["search"] = f"%{search}%"
-
-        query += " ORDER BY name ASC LIMIT :limit OFFSET :offset"
-        params["limit"] = str(limit)
-        params["offset"] = str(offset)
-
-        exercises = DatabaseModel.execute_query(query, params)
+            # Same matches as the LOWER(name) LIKE '%search%' this replaced
+            pattern = like_pattern(search)
+            exercises = [
+                exercise
+                for exercise in exercises
+                if pattern.search(exercise["name"].casefold())
+            ]
+
+        exercises = exercises[offset : offset + limit]
         return [Exercise(**exercise) for exercise in exercises]
     except Exception as e:
         logger.error(f"Failed to fetch exercises: {str(e)}")
@@ -112,7 +156,8 @@ async def update_exercise(
     try:
         # Check if exercise exists
         existing_query = """
-            SELECT id FROM dradic_tech.exercises WHERE id = :exercise_id
+            SELECT id, muscles_trained FROM dradic_tech.exercises
+            WHERE id = :exercise_id
         """
         existing = DatabaseModel.execute_query(
             existing_query, {"exercise_id": str(exercise_id)}
@@ -144,6 +189,11 @@ async def update_exercise(
 
         if not updated_exercise:
             raise HTTPException(status_code=404, detail="Exercise not found")
+        invalidate_exercise_catalog()
+
+        # Daily stats store muscle volume split by muscles_trained
+        if updated_exercise["muscles_trained"] != existing[0]["muscles_trained"]:
+            refresh_gym_daily_stats_for_exercise(exercise_id)
 
         return Exercise(**updated_exercise)
     except HTTPException:
@@ -188,6 +238,7 @@ async def delete_exercise(
             )
 
         deleted = DatabaseModel.delete_record("exercises", str(exercise_id))
+        invalidate_exercise_catalog()
 
         if not deleted:
             raise HTTPException(status_code=404, detail="Exercise not found")
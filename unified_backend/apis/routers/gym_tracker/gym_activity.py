@@ -1,6 +1,6 @@
 import logging as logger
-from datetime import date, datetime, timedelta
-from typing import Optional
+from datetime import date, timedelta
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -10,16 +10,26 @@ from models import (
     GymActivityCreate,
     GymActivityWithDetails,
     GymActivityResponse,
+    GymDailyStats,
     GymDashboardStats,
 )
 from utils.auth import get_current_user
 from utils.db import DatabaseModel
+from utils.gym_daily_stats import refresh_gym_daily_stats
+from utils.personal_records import (
+    record_activity,
+    record_activity_deletion,
+    record_activity_update,
+)
 
 gym_activity_router = APIRouter()
 
 # Module-level singleton for dependency injection
 current_user_dependency = Depends(get_current_user)
 
+# Longest range /dashboard/daily returns, a year of daily rows
+DAILY_STATS_MAX_DAYS = 366
+
 
 @gym_activity_router.post("/", response_model=GymActivity)
 async def create_activity(
@@ -54,6 +64,8 @@ async def create_activity(
         activity_data["user_id"] = user_id
 
         new_activity = DatabaseModel.insert_record("gym_activity", activity_data)
+        refresh_gym_daily_stats(user_id, new_activity["created_at"].date())
+        record_activity(user_id, new_activity)
         return GymActivity(**new_activity)
     except HTTPException:
         raise
@@ -185,7 +197,8 @@ async def update_activity(
 
         # Check if activity exists and belongs to user
         existing_query = """
-            SELECT user_id FROM dradic_tech.gym_activity WHERE id = :activity_id
+            SELECT user_id, exercise_id FROM dradic_tech.gym_activity
+            WHERE id = :activity_id
         """
         existing = DatabaseModel.execute_query(
             existing_query, {"activity_id": str(activity_id)}
@@ -229,6 +242,8 @@ async def update_activity(
         if not updated_activity:
             raise HTTPException(status_code=404, detail="Activity not found")
 
+        refresh_gym_daily_stats(user_id, updated_activity["created_at"].date())
+        record_activity_update(user_id, existing[0]["exercise_id"], updated_activity)
         return GymActivity(**updated_activity)
     except HTTPException:
         raise
@@ -249,7 +264,8 @@ async def delete_activity(
 
         # Check if activity exists and belongs to user
         existing_query = """
-            SELECT user_id FROM dradic_tech.gym_activity WHERE id = :activity_id
+            SELECT id, user_id, exercise_id, created_at FROM dradic_tech.gym_activity
+            WHERE id = :activity_id
         """
         existing = DatabaseModel.execute_query(
             existing_query, {"activity_id": str(activity_id)}
@@ -268,6 +284,8 @@ async def delete_activity(
         if not deleted:
             raise HTTPException(status_code=404, detail="Activity not found")
 
+        refresh_gym_daily_stats(user_id, existing[0]["created_at"].date())
+        record_activity_deletion(user_id, existing[0])
         return {"message": "Activity deleted successfully"}
     except HTTPException:
         raise
@@ -285,88 +303,76 @@ async def get_dashboard_stats(current_user: dict = current_user_dependency):
         user_id = current_user.get("uid")
 
         # Get current month's start and end dates
-        today = datetime.now()
-        first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        # Get total workouts this month
-        workouts_query = """
-            SELECT COUNT(*) as count
-            FROM dradic_tech.gym_activity
-            WHERE user_id = :user_id
-            AND created_at >= :start_date
-        """
-        workouts_result = DatabaseModel.execute_query(
-            workouts_query, {"user_id": user_id, "start_date": str(first_day_of_month)}
-        )
-        total_workouts = workouts_result[0]["count"] if workouts_result else 0
-
-        # Get total weight lifted this month
-        weight_query = """
-            SELECT SUM(sets * reps * COALESCE(weight, 0)) as total_weight
-            FROM dradic_tech.gym_activity
-            WHERE user_id = :user_id
-            AND created_at >= :start_date
-            AND weight IS NOT NULL
-        """
-        weight_result = DatabaseModel.execute_query(
-            weight_query, {"user_id": user_id, "start_date": str(first_day_of_month)}
-        )
-        total_weight = float(weight_result[0]["total_weight"] or 0) if weight_result else 0.0
-
-        # Get activities by date (last 30 days)
-        thirty_days_ago = today - timedelta(days=30)
-        activities_by_date_query = """
-            SELECT
-                DATE(created_at) as activity_date,
-                COUNT(*) as count
-            FROM dradic_tech.gym_activity
-            WHERE user_id = :user_id
-            AND created_at >= :start_date
-            GROUP BY DATE(created_at)
-            ORDER BY activity_date
-        """
-        activities_by_date_result = DatabaseModel.execute_query(
-            activities_by_date_query,
-            {"user_id": user_id, "start_date": str(thirty_days_ago)},
-        )
-        activities_by_date = {
-            str(row["activity_date"]): row["count"]
-            for row in activities_by_date_result
-        } if activities_by_date_result else {}
-
-        # Get muscle groups distribution (last 30 days)
-        muscle_groups_query = """
+        today = date.today()
+        first_day_of_month = today.replace(day=1)
+        # gym_daily_stats has whole days, so the window is the last 30 days
+        # including today rather than the 30 * 24 hours before now
+        window_start = today - timedelta(days=29)
+
+        # Totals for this month, per-day counts and muscle volume for the last
+        # 30 days, from one gym_daily_stats row per day
+        stats_query = """
+            WITH recent AS (
+                SELECT day, activities, tonnage, muscle_volume
+                FROM dradic_tech.gym_daily_stats
+                WHERE user_id = :user_id
+                AND day >= :since
+            ),
+            totals AS (
+                SELECT
+                    SUM(activities) FILTER (WHERE day >= :month_start) as total_workouts,
+                    SUM(tonnage) FILTER (WHERE day >= :month_start) as total_weight
+                FROM recent
+            ),
+            by_date AS (
+                SELECT to_char(day, 'YYYY-MM-DD') as activity_date, activities as count
+                FROM recent
+                WHERE day >= :window_start
+            ),
+            by_muscle AS (
+                SELECT
+                    m.key as muscle,
+                    SUM(m.value::numeric) as volume
+                FROM recent r
+                CROSS JOIN LATERAL jsonb_each(r.muscle_volume) m
+                WHERE r.day >= :window_start
+                GROUP BY m.key
+            )
             SELECT
-                e.muscles_trained,
-                ga.sets,
-                ga.reps
-            FROM dradic_tech.gym_activity ga
-            JOIN dradic_tech.exercises e ON ga.exercise_id = e.id
-            WHERE ga.user_id = :user_id
-            AND ga.created_at >= :start_date
+                t.total_workouts,
+                t.total_weight,
+                (
+                    SELECT json_object_agg(activity_date, count ORDER BY activity_date)
+                    FROM by_date
+                ) as activities_by_date,
+                (
+                    SELECT json_object_agg(muscle, volume ORDER BY volume DESC, muscle)
+                    FROM by_muscle
+                ) as muscle_groups_distribution,
+                (
+                    SELECT muscle FROM by_muscle ORDER BY volume DESC, muscle LIMIT 1
+                ) as most_trained_muscle
+            FROM totals t
         """
-        muscle_groups_result = DatabaseModel.execute_query(
-            muscle_groups_query,
-            {"user_id": user_id, "start_date": str(thirty_days_ago)},
+        result = DatabaseModel.execute_query(
+            stats_query,
+            {
+                "user_id": user_id,
+                "since": str(min(first_day_of_month, window_start)),
+                "month_start": str(first_day_of_month),
+                "window_start": str(window_start),
+            },
         )
+        stats = result[0] if result else {}
 
-        # Calculate muscle group totals (based on volume: sets * reps * percentage)
-        muscle_totals = {}
-        if muscle_groups_result:
-            for row in muscle_groups_result:
-                muscles = row["muscles_trained"]
-                sets = row["sets"]
-                reps = row["reps"]
-                volume = sets * reps
-
-                for muscle, percentage in muscles.items():
-                    muscle_volume = volume * (percentage / 100)
-                    muscle_totals[muscle] = muscle_totals.get(muscle, 0) + muscle_volume
-
-        # Find most trained muscle
-        most_trained_muscle = None
-        if muscle_totals:
-            most_trained_muscle = max(muscle_totals, key=muscle_totals.get)
+        total_workouts = stats.get("total_workouts") or 0
+        total_weight = float(stats.get("total_weight") or 0)
+        activities_by_date = stats.get("activities_by_date") or {}
+        distribution = stats.get("muscle_groups_distribution") or {}
+        muscle_totals = {
+            muscle: float(volume) for muscle, volume in distribution.items()
+        }
+        most_trained_muscle = stats.get("most_trained_muscle")
 
         return GymDashboardStats(
             total_workouts_this_month=total_workouts,
@@ -382,3 +388,53 @@ async def get_dashboard_stats(current_user: dict = current_user_dependency):
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch dashboard stats: {str(e)}"
         ) from e
+
+
+@gym_activity_router.get("/dashboard/daily", response_model=List[GymDailyStats])
+async def get_daily_stats(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: dict = current_user_dependency,
+):
+    """Get per-day totals for calendars and progress charts (default: last year)"""
+    try:
+        user_id = current_user.get("uid")
+
+        end_date = end_date or date.today()
+        start_date = start_date or end_date - timedelta(days=DAILY_STATS_MAX_DAYS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(
+                status_code=400, detail="start_date must not be after end_date"
+            )
+
+        if (end_date - start_date).days >= DAILY_STATS_MAX_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Date range cannot exceed {DAILY_STATS_MAX_DAYS} days",
+            )
+
+        query = """
+            SELECT day, activities, sets, reps, tonnage, muscle_volume
+            FROM dradic_tech.gym_daily_stats
+            WHERE user_id = :user_id
+            AND day BETWEEN :start_date AND :end_date
+            ORDER BY day
+        """
+        rows = DatabaseModel.execute_query(
+            query,
+            {
+                "user_id": user_id,
+                "start_date": str(start_date),
+                "end_date": str(end_date),
+            },
+        )
+
+        return [GymDailyStats(**row) for row in rows]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch daily stats: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch daily stats: {str(e)}"
+        ) from e
@@ -0,0 +1,44 @@
+import logging as logger
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from models import PersonalRecord, PersonalRecordResponse
+from utils.auth import get_current_user
+from utils.db import DatabaseModel
+
+personal_records_router = APIRouter()
+
+# Module-level singleton for dependency injection
+current_user_dependency = Depends(get_current_user)
+
+
+@personal_records_router.get("/", response_model=PersonalRecordResponse)
+async def get_personal_records(current_user: dict = current_user_dependency):
+    """Get the user's personal records for every exercise they have logged"""
+    try:
+        user_id = current_user.get("uid")
+
+        # One primary-key range read; records are kept current on every
+        # activity write
+        query = """
+            SELECT
+                pr.*,
+                e.name as exercise_name
+            FROM dradic_tech.personal_records pr
+            JOIN dradic_tech.exercises e ON pr.exercise_id = e.id
+            WHERE pr.user_id = :user_id
+            ORDER BY e.name ASC
+        """
+        records = DatabaseModel.execute_query(query, {"user_id": user_id})
+
+        return PersonalRecordResponse(
+            records=[PersonalRecord(**record) for record in records],
+            total_count=len(records),
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch personal records: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch personal records: {str(e)}"
+        ) from e
@@ -0,0 +1,37 @@
+"""Rebuild gym_daily_stats from gym_activity.
+
+The API refreshes a user's row for a day whenever an activity on that day is
+written, and every day an exercise was logged when its muscles_trained is
+changed through the API. Run this after bulk imports or manual edits to
+gym_activity or exercises, or on a schedule to repair any missed refresh.
+
+    uv run python scripts/rebuild_gym_daily_stats.py [--user USER_ID]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils.gym_daily_stats import rebuild_gym_daily_stats  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="Only rebuild this user's rows")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = rebuild_gym_daily_stats(args.user)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    scope = f"user {args.user}" if args.user else "all users"
+    print(f"Rebuilt {written} daily row(s) for {scope} in {elapsed_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import os
-import jwt
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, Request
-from supabase import create_client, Client
+
+# ASGI scope key carrying an already verified user, set by in-process
+# dispatch (batch sub-requests). Clients can't set scope keys, only headers.
+PREAUTHENTICATED_USER_SCOPE_KEY = "dradic.preauthenticated_user"
 
 async def get_credentials_from_token(token: str) -> Optional[Dict[str, Any]]:
     """
@@ -16,8 +18,10 @@ async def get_credentials_from_token(token: str) -> Optional[Dict[str, Any]]:
         if not supabase_url or not supabase_service_key:
             raise ValueError("Missing Supabase configuration")
         
-        # Create Supabase client
-        supabase: Client = create_client(supabase_url, supabase_service_key)
+        # Create Supabase client (imported here, it's slow to import)
+        from supabase import create_client
+
+        supabase = create_client(supabase_url, supabase_service_key)
         
         # Verify token using Supabase
         response = supabase.auth.get_user(token)
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.storage import ObjectNotFound, StorageBackend
+from utils.supabase_service import supabase_service
+
+logger = logging.getLogger(__name__)
+
+# Static copy of the public blog, written to the bucket whenever a post changes
+# so readers can be served by the bucket or a CDN without hitting the API.
+# Everything except the pointer and the stable feed/sitemap names is named by
+# content hash and never changes once written.
+BLOG_STATIC_PREFIX = os.getenv("BLOG_STATIC_PREFIX", "blog_static/")
+BLOG_SITE_URL = os.getenv("BLOG_SITE_URL", "https://dradic.cl").rstrip("/")
+BLOG_FEED_TITLE = os.getenv("BLOG_FEED_TITLE", "Dradic Technologies Blog")
+BLOG_FEED_MAX_ENTRIES = int(os.getenv("BLOG_FEED_MAX_ENTRIES", "20"))
+BLOG_STATIC_POINTER_MAX_AGE_SECONDS = int(
+    os.getenv("BLOG_STATIC_POINTER_MAX_AGE_SECONDS", "60")
+)
+
+BLOG_STATIC_POINTER = "latest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+_publish_lock = threading.Lock()
+
+
+def public_metadata(slug: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the metadata of a post as the blog API serves it"""
+    now = datetime.now().isoformat()
+    return {
+        "slug": slug,
+        "title": metadata.get("title", "Untitled"),
+        "created_at": metadata.get("created_at", now),
+        "updated_at": metadata.get("updated_at", now),
+        "image": metadata.get("image", ""),
+        "category": metadata.get("category", ""),
+        "author": metadata.get("author", ""),
+        "excerpt": metadata.get("excerpt"),
+        "word_count": metadata.get("word_count"),
+        "reading_time": metadata.get("reading_time"),
+        "outline": metadata.get("outline"),
+    }
+
+
+def post_url(slug: str) -> str:
+    return f"{BLOG_SITE_URL}/blog/{slug}"
+
+
+def versioned_name(name: str, extension: str, data: bytes) -> str:
+    """Name an artifact after its content, e.g. index.3f2a9c1e0b7d4a66.json"""
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    return f"{name}.{digest}.{extension}"
+
+
+def to_json_bytes(document: Any) -> bytes:
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def build_post_document(slug: str, metadata: Dict[str, Any], body: str) -> bytes:
+    """Per-post JSON, shaped like GET /api/blog/posts-separated/{slug}"""
+    return to_json_bytes(
+        {
+            "metadata": public_metadata(slug, metadata),
+            "content": body,
+            "content_format": "markdown",
+        }
+    )
+
+
+def build_index(posts: List[Tuple[Dict[str, Any], str]]) -> bytes:
+    """Index JSON: every post's metadata and the name of its post JSON,
+    newest created_at first"""
+    ordered = sorted(
+        posts, key=lambda item: (item[0]["created_at"], item[0]["slug"]), reverse=True
+    )
+    return to_json_bytes(
+        {
+            "posts": [{"metadata": metadata, "url": url} for metadata, url in ordered],
+            "total_count": len(ordered),
+        }
+    )
+
+
+def _rfc3339(timestamp: str) -> str:
+    """Format a frontmatter timestamp for feeds and sitemaps, assuming UTC"""
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        parsed = datetime.now(timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_atom_feed(posts: List[Dict[str, Any]]) -> bytes:
+    """Atom feed of the most recent posts"""
+    recent = sorted(posts, key=lambda post: post["created_at"], reverse=True)[
+        :BLOG_FEED_MAX_ENTRIES
+    ]
+
+    feed = ET.Element("feed", xmlns=_ATOM_NS)
+    ET.SubElement(feed, "title").text = BLOG_FEED_TITLE
+    ET.SubElement(feed, "id").text = f"{BLOG_SITE_URL}/blog"
+    ET.SubElement(feed, "link", href=f"{BLOG_SITE_URL}/blog")
+    ET.SubElement(feed, "updated").text = max(
+        (_rfc3339(post["updated_at"]) for post in recent),
+        default="1970-01-01T00:00:00Z",
+    )
+
+    for post in recent:
+        entry = ET.SubElement(feed, "entry")
+        ET.SubElement(entry, "title").text = post["title"]
+        ET.SubElement(entry, "id").text = post_url(post["slug"])
+        ET.SubElement(entry, "link", href=post_url(post["slug"]))
+        ET.SubElement(entry, "published").text = _rfc3339(post["created_at"])
+        ET.SubElement(entry, "updated").text = _rfc3339(post["updated_at"])
+        ET.SubElement(ET.SubElement(entry, "author"), "name").text = (
+            post["author"] or BLOG_FEED_TITLE
+        )
+        if post["category"]:
+            ET.SubElement(entry, "category", term=post["category"])
+        if post["excerpt"]:
+            ET.SubElement(entry, "summary").text = post["excerpt"]
+
+    return ET.tostring(feed, encoding="utf-8", xml_declaration=True)
+
+
+def build_sitemap(posts: List[Dict[str, Any]]) -> bytes:
+    """Sitemap of the blog index and every post"""
+    urlset = ET.Element("urlset", xmlns=_SITEMAP_NS)
+    ET.SubElement(ET.SubElement(urlset, "url"), "loc").text = f"{BLOG_SITE_URL}/blog"
+    for post in sorted(posts, key=lambda post: post["slug"]):
+        url = ET.SubElement(urlset, "url")
+        ET.SubElement(url, "loc").text = post_url(post["slug"])
+        ET.SubElement(url, "lastmod").text = _rfc3339(post["updated_at"])
+    return ET.tostring(urlset, encoding="utf-8", xml_declaration=True)
+
+
+def _load_pointer(storage: StorageBackend) -> Dict[str, Any]:
+    try:
+        return json.loads(
+            storage.get(f"{BLOG_STATIC_PREFIX}{BLOG_STATIC_POINTER}").read()
+        )
+    except ObjectNotFound:
+        return {}
+    except ValueError as e:
+        logger.error(f"Ignoring unreadable blog static pointer: {e}")
+        return {}
+
+
+def _put_versioned(
+    storage: StorageBackend,
+    name: str,
+    extension: str,
+    data: bytes,
+    content_type: str,
+    published: Optional[str],
+) -> str:
+    """Write an immutable artifact unless the last publish already has it"""
+    versioned = versioned_name(name, extension, data)
+    if versioned != published:
+        storage.put(
+            f"{BLOG_STATIC_PREFIX}{versioned}",
+            data,
+            content_type=content_type,
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+        )
+    return versioned
+
+
+def publish_blog_bundle() -> Optional[Dict[str, Any]]:
+    """Write the static blog bundle and return the new pointer.
+
+    Post JSON is only rebuilt for posts whose ETag changed since the last
+    publish; the index, feed and sitemap are rebuilt from the summary
+    manifest, so no other post bodies are downloaded. Runs after every blog
+    write; failures are logged, since the API keeps serving the posts.
+    """
+    with _publish_lock:
+        try:
+            return _publish(supabase_service.storage)
+        except Exception as e:
+            logger.error(f"Failed to publish static blog bundle: {e}")
+            return None
+
+
+def _publish(storage: StorageBackend) -> Dict[str, Any]:
+    manifest = supabase_service.get_blog_manifest()
+    pointer = _load_pointer(storage)
+    published_posts: Dict[str, Dict[str, str]] = pointer.get("posts", {})
+
+    posts: Dict[str, Dict[str, str]] = {
+        slug: published_posts[slug]
+        for slug, entry in manifest.items()
+        if slug in published_posts and published_posts[slug]["etag"] == entry["etag"]
+    }
+    stale = [slug for slug in manifest if slug not in posts]
+    fetched = {post.slug: post for post in supabase_service.get_blog_posts(stale)}
+    for slug in stale:
+        if slug in fetched:
+            continue
+        # A post that couldn't be fetched keeps its last published version,
+        # and its old ETag makes the next publish retry it. A post that was
+        # never published can't be listed yet, so the whole publish waits.
+        if slug not in published_posts:
+            raise RuntimeError(f"Could not fetch unpublished blog post {slug}")
+        logger.warning(f"Could not fetch blog post {slug}; keeping its last version")
+        posts[slug] = published_posts[slug]
+
+    for post in fetched.values():
+        name = _put_versioned(
+            storage,
+            f"posts/{post.slug}",
+            "json",
+            build_post_document(post.slug, post.metadata, post.body),
+            "application/json",
+            None,
+        )
+        posts[post.slug] = {"etag": manifest[post.slug]["etag"], "url": name}
+
+    listed = [
+        public_metadata(slug, manifest[slug]["metadata"]) for slug in sorted(posts)
+    ]
+    index = build_index(
+        [(metadata, posts[metadata["slug"]]["url"]) for metadata in listed]
+    )
+    feed = build_atom_feed(listed)
+    sitemap = build_sitemap(listed)
+
+    new_pointer = {
+        "index": _put_versioned(
+            storage, "index", "json", index, "application/json", pointer.get("index")
+        ),
+        "feed": _put_versioned(
+            storage, "feed", "xml", feed, "application/atom+xml", pointer.get("feed")
+        ),
+        "sitemap": _put_versioned(
+            storage,
+            "sitemap",
+            "xml",
+            sitemap,
+            "application/xml",
+            pointer.get("sitemap"),
+        ),
+        "posts": posts,
+    }
+    if new_pointer == pointer:
+        return pointer
+
+    # Crawlers and feed readers need fixed URLs, so these names are rewritten
+    # in place with a short max-age
+    short_cache = f"public, max-age={BLOG_STATIC_POINTER_MAX_AGE_SECONDS}"
+    if new_pointer["feed"] != pointer.get("feed"):
+        storage.put(
+            f"{BLOG_STATIC_PREFIX}feed.xml",
+            feed,
+            content_type="application/atom+xml",
+            cache_control=short_cache,
+        )
+    if new_pointer["sitemap"] != pointer.get("sitemap"):
+        storage.put(
+            f"{BLOG_STATIC_PREFIX}sitemap.xml",
+            sitemap,
+            content_type="application/xml",
+            cache_control=short_cache,
+        )
+
+    # Written last, so readers never see a pointer to missing artifacts
+    storage.put(
+        f"{BLOG_STATIC_PREFIX}{BLOG_STATIC_POINTER}",
+        to_json_bytes(new_pointer),
+        content_type="application/json",
+        cache_control=f"{short_cache}, must-revalidate",
+    )
+    logger.info(
+        f"Published static blog bundle {new_pointer['index']} "
+        f"({len(stale)} post(s) rebuilt)"
+    )
+    return new_pointer
@@ -0,0 +1,94 @@
+import json
+import math
+import re
+from typing import Any, Dict, List
+
+from utils.search_index import markdown_to_text, tokenize
+
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
+# Frontmatter fields written at publish time, and how to read them back
+SUMMARY_FIELDS = ("excerpt", "word_count", "reading_time", "outline")
+
+_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_ANCHOR_STRIP_RE = re.compile(r"[^\w\- ]+", re.UNICODE)
+
+
+def make_excerpt(body: str, length: int = EXCERPT_LENGTH) -> str:
+    """Return the opening of a post as plain text, cut at a word boundary"""
+    text = markdown_to_text(body)
+    if len(text) <= length:
+        return text
+
+    cut = text.rfind(" ", 0, length)
+    return f"{text[: cut if cut > 0 else length].rstrip()}…"
+
+
+def make_outline(body: str) -> List[Dict[str, Any]]:
+    """Return the ATX headings of a post, skipping fenced code blocks"""
+    outline = []
+    fence = None
+    for line in body.splitlines():
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+            continue
+        if fence is not None:
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            text = markdown_to_text(heading.group(2))
+            outline.append(
+                {
+                    "level": len(heading.group(1)),
+                    "text": text,
+                    "anchor": _ANCHOR_STRIP_RE.sub("", text.lower()).replace(" ", "-"),
+                }
+            )
+    return outline
+
+
+def summarize_post(body: str) -> Dict[str, Any]:
+    """Compute the excerpt, word count, reading time and outline of a post"""
+    word_count = len(tokenize(markdown_to_text(body)))
+    return {
+        "excerpt": make_excerpt(body),
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+        "outline": make_outline(body),
+    }
+
+
+def summary_frontmatter(summary: Dict[str, Any]) -> str:
+    """Format a summary as frontmatter lines, one field per line"""
+    return "\n".join(
+        [
+            f"excerpt: {summary['excerpt']}",
+            f"word_count: {summary['word_count']}",
+            f"reading_time: {summary['reading_time']}",
+            f"outline: {json.dumps(summary['outline'])}",
+        ]
+    )
+
+
+def parse_summary_fields(metadata: Dict[str, str]) -> Dict[str, Any]:
+    """Read summary fields back from parsed frontmatter, or {} if incomplete"""
+    if not all(field in metadata for field in SUMMARY_FIELDS):
+        return {}
+
+    try:
+        return {
+            "excerpt": metadata["excerpt"],
+            "word_count": int(metadata["word_count"]),
+            "reading_time": int(metadata["reading_time"]),
+            "outline": json.loads(metadata["outline"]),
+        }
+    except (TypeError, ValueError):
+        return {}
@@ -0,0 +1,110 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class BucketKeyIndex:
+    """In-memory index of bucket keys for filename lookups.
+
+    The full listing is loaded lazily and reloaded once it is older than the
+    TTL or after invalidate() is called. Lookups never list the bucket
+    themselves, and always resolve ties the same way: exact key, then exact
+    file name, then prefix, then substring matches, preferring the shortest
+    key and then alphabetical order within each tier.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Iterable[Dict[str, Any]]],
+        ttl_seconds: float = 300,
+    ):
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._keys: List[str] = []  # Lowercased keys, sorted
+        self._names: List[tuple[str, str]] = []  # (lowercased file name, key)
+        self._key_by_lower: Dict[str, str] = {}
+
+    def invalidate(self):
+        """Force a reload of the listing on the next lookup"""
+        with self._lock:
+            self._loaded_at = None
+
+    def find(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the best match for query, or None"""
+        self._ensure_loaded()
+        needle = query.strip().lower()
+        if not needle:
+            return None
+
+        with self._lock:
+            # Exact key
+            key = self._key_by_lower.get(needle)
+            if key is not None:
+                return self._entries[key]
+
+            # Exact file name
+            matches = self._name_prefix_matches(needle, exact=True)
+            if matches:
+                return self._entries[self._pick(matches)]
+
+            # Key or file name prefix
+            matches = self._key_prefix_matches(needle) + self._name_prefix_matches(
+                needle, exact=False
+            )
+            if matches:
+                return self._entries[self._pick(matches)]
+
+            # Substring anywhere in the key
+            matches = [
+                self._key_by_lower[lower] for lower in self._keys if needle in lower
+            ]
+            if matches:
+                return self._entries[self._pick(matches)]
+
+        return None
+
+    def _ensure_loaded(self):
+        with self._lock:
+            fresh = (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at < self._ttl_seconds
+            )
+        if fresh:
+            return
+
+        entries = {entry["key"]: entry for entry in self._loader()}
+        key_by_lower = {key.lower(): key for key in entries}
+        names = sorted((key.rsplit("/", 1)[-1].lower(), key) for key in entries)
+
+        with self._lock:
+            self._entries = entries
+            self._key_by_lower = key_by_lower
+            self._keys = sorted(key_by_lower)
+            self._names = names
+            self._loaded_at = time.monotonic()
+
+    def _key_prefix_matches(self, needle: str) -> List[str]:
+        start = bisect.bisect_left(self._keys, needle)
+        matches = []
+        for lower in self._keys[start:]:
+            if not lower.startswith(needle):
+                break
+            matches.append(self._key_by_lower[lower])
+        return matches
+
+    def _name_prefix_matches(self, needle: str, exact: bool) -> List[str]:
+        start = bisect.bisect_left(self._names, (needle, ""))
+        matches = []
+        for name, key in self._names[start:]:
+            if not name.startswith(needle) or (exact and name != needle):
+                break
+            matches.append(key)
+        return matches
+
+    @staticmethod
+    def _pick(keys: List[str]) -> str:
+        return min(keys, key=lambda key: (len(key), key))
@@ -1,9 +1,21 @@
+import asyncio
 import os
-from typing import Any, Dict, List, Optional, TypeVar
+import threading
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID, uuid4
 import uuid
 
-import pandas as pd
 from pydantic import BaseModel
 from sqlalchemy import (
     Boolean,
@@ -22,6 +34,10 @@ from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.sql import func
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
 # Database connection
 SQLALCHEMY_DATABASE_URL = os.getenv("SUPABASE_DATABASE_URL")
 
@@ -36,6 +52,180 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Pooled connections opened at startup, so early requests don't pay to connect
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "2"))
+
+
+def warm_up_pool(connections: int = DB_WARMUP_CONNECTIONS) -> int:
+    """Open up to `connections` pool connections at once and return them to
+    the pool; returns how many were opened"""
+    opened = []
+    try:
+        for _ in range(min(connections, engine.pool.size())):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+# Bulk reads stream COPY ... TO STDOUT as CSV through a pipe, so results are
+# parsed into columns by pandas' (or Arrow's) C reader without building a
+# Python object per row, and never have to fit in memory as a whole
+DB_COPY_CHUNK_ROWS = int(os.getenv("DB_COPY_CHUNK_ROWS", "100000"))
+DB_COPY_BUFFER_BYTES = int(os.getenv("DB_COPY_BUFFER_BYTES", str(1024 * 1024)))
+
+# Postgres writes booleans as t/f in CSV. NULL is written as \N so it can't be
+# confused with an empty string or with text such as "NA" (pandas still reads
+# a quoted "\N" string as NULL; Arrow doesn't)
+_CSV_NULL = "\\N"
+_CSV_BOOLEANS = {"true_values": ["t"], "false_values": ["f"]}
+
+# Column type OIDs (pg_type) read as something other than text
+_PG_BOOLEANS = {16}
+_PG_INTEGERS = {20, 21, 23}
+_PG_FLOATS = {700, 701, 1700}  # numeric is read as float64, not Decimal
+_PG_TIMESTAMPS = {1082, 1114}  # date, timestamp
+_PG_TIMESTAMPTZ = {1184}
+
+# (name, type OID) of each result column
+ColumnTypes = List[Tuple[str, int]]
+
+
+def _render_select(cursor: Any, query: str, params: Optional[Dict]) -> str:
+    """Render a :name-parameterized SELECT as plain SQL.
+
+    COPY can't take bind parameters, so they're rendered client-side with the
+    driver's own quoting.
+    """
+    compiled = text(query.strip().rstrip(";").rstrip()).compile(dialect=engine.dialect)
+    bound = {name: (params or {}).get(name) for name in compiled.params}
+    return cursor.mogrify(compiled.string, bound).decode("utf-8")
+
+
+@contextmanager
+def copy_csv_stream(
+    query: str, params: Optional[Dict] = None
+) -> Iterator[Tuple[BinaryIO, ColumnTypes]]:
+    """Yield a readable stream of the query's rows as CSV with a header, and
+    the name and type OID of each column.
+
+    A worker thread runs the COPY on a pooled connection and writes into a
+    pipe. If the reader stops early the query is cancelled and the connection
+    is discarded instead of returned to the pool.
+    """
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            select = _render_select(cursor, query, params)
+            # CSV carries no types, so read them from an empty run of the query
+            cursor.execute(f"SELECT * FROM ({select}) AS typed LIMIT 0")
+            columns = [(column.name, column.type_code) for column in cursor.description]
+    except BaseException:
+        raw.invalidate()
+        raise
+
+    options = f"FORMAT csv, HEADER true, NULL '{_CSV_NULL}'"
+    statement = f"COPY ({select}) TO STDOUT WITH ({options})"
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, "rb", buffering=DB_COPY_BUFFER_BYTES)
+    errors: List[BaseException] = []
+    # Set by the producer once the COPY has returned or failed; from then on
+    # the connection is the producer's to close or discard. The lock makes
+    # the consumer's check-and-cancel atomic with respect to that hand-off.
+    copy_done = threading.Event()
+    copy_lock = threading.Lock()
+
+    def produce():
+        try:
+            with os.fdopen(write_fd, "wb") as writer:
+                try:
+                    with raw.cursor() as cursor:
+                        cursor.copy_expert(statement, writer, size=DB_COPY_BUFFER_BYTES)
+                finally:
+                    # Before the writer closes, so a reader at EOF sees it set
+                    with copy_lock:
+                        copy_done.set()
+            raw.close()
+        except BaseException as e:
+            errors.append(e)
+            raw.invalidate()
+
+    producer = threading.Thread(target=produce, name="db-copy", daemon=True)
+    producer.start()
+    # The reader may also have been closed under us (pandas closes it when a
+    # chunked read is abandoned), in which case the producer fails with a
+    # broken pipe
+    stopped_early = False
+    try:
+        yield reader, columns
+    except BaseException:
+        stopped_early = True
+        raise
+    finally:
+        with copy_lock:
+            if not copy_done.is_set():
+                # Stopped reading before the end: stop the server side as well
+                stopped_early = True
+                raw.driver_connection.cancel()
+        reader.close()
+        producer.join()
+
+        # A failed query surfaces as truncated CSV to the reader; report the
+        # database error instead
+        if errors and not stopped_early:
+            raise errors[0]
+
+
+def _read_csv_options(
+    columns: ColumnTypes, overrides: Dict[str, Any]
+) -> Dict[str, Any]:
+    """pandas.read_csv options reading each column as its Postgres type
+    would be, with caller options (e.g. dtype, parse_dates) taking precedence"""
+    dtype: Dict[str, Any] = {}
+    for name, type_code in columns:
+        if type_code in _PG_BOOLEANS:
+            dtype[name] = "boolean"
+        elif type_code in _PG_INTEGERS:
+            dtype[name] = "Int64"
+        elif type_code in _PG_FLOATS:
+            dtype[name] = "float64"
+        elif type_code not in _PG_TIMESTAMPS | _PG_TIMESTAMPTZ:
+            # Text stays text: no "00123" -> 123
+            dtype[name] = object
+    dtype.update(overrides.get("dtype") or {})
+
+    return {
+        **_CSV_BOOLEANS,
+        "keep_default_na": False,
+        "na_values": [_CSV_NULL],
+        **overrides,
+        "dtype": dtype,
+    }
+
+
+def _convert_columns(
+    frame: "pd.DataFrame", columns: ColumnTypes, overrides: Dict[str, Any]
+) -> "pd.DataFrame":
+    """Parse date and timestamp columns and give text NULLs back as None,
+    except for columns the caller read its own way"""
+    import pandas as pd
+
+    handled = {*(overrides.get("dtype") or {}), *(overrides.get("parse_dates") or [])}
+    for name, type_code in columns:
+        if name in handled or name not in frame:
+            continue
+        if type_code in _PG_TIMESTAMPS:
+            frame[name] = pd.to_datetime(frame[name], format="ISO8601")
+        elif type_code in _PG_TIMESTAMPTZ:
+            frame[name] = pd.to_datetime(frame[name], format="ISO8601", utc=True)
+        elif frame[name].dtype == object:
+            frame[name] = frame[name].where(frame[name].notna(), None)
+    return frame
+
+
 # Define schema metadata
 metadata = MetaData(schema="dradic_tech")
 
@@ -179,13 +369,72 @@ class DatabaseModel(BaseModel):
         from_attributes = True
 
     @staticmethod
-    def fetch_as_dataframe(query: str, params: Optional[Dict] = None) -> pd.DataFrame:
-        """Execute a raw SQL query and return results as a pandas DataFrame"""
-        with engine.connect() as conn:
-            result = conn.execute(text(query), params or {})
-            columns = result.keys()
-            data = result.fetchall()
-            return pd.DataFrame(data, columns=columns)
+    def fetch_as_dataframe(
+        query: str, params: Optional[Dict] = None, **read_csv_options: Any
+    ) -> "pd.DataFrame":
+        """Execute a raw SQL query and return results as a pandas DataFrame.
+
+        Rows are bulk-read with COPY, and each column is read as its Postgres
+        type: text as str with NULL as None, integers as Int64, numeric and
+        floats as float64, dates and timestamps as datetime64.
+        read_csv_options (e.g. dtype, parse_dates) are passed to
+        pandas.read_csv and override that for the columns they name.
+        """
+        import pandas as pd
+
+        with copy_csv_stream(query, params) as (stream, columns):
+            options = _read_csv_options(columns, read_csv_options)
+            frame = pd.read_csv(stream, low_memory=False, **options)
+        return _convert_columns(frame, columns, read_csv_options)
+
+    @staticmethod
+    def iter_dataframes(
+        query: str,
+        params: Optional[Dict] = None,
+        chunk_rows: int = DB_COPY_CHUNK_ROWS,
+        **read_csv_options: Any,
+    ) -> Iterator["pd.DataFrame"]:
+        """Execute a raw SQL query and yield its results as DataFrames of up
+        to chunk_rows rows, for results too big to load at once"""
+        import pandas as pd
+
+        with copy_csv_stream(query, params) as (stream, columns):
+            options = _read_csv_options(columns, read_csv_options)
+            for chunk in pd.read_csv(stream, chunksize=chunk_rows, **options):
+                yield _convert_columns(chunk, columns, read_csv_options)
+
+    @staticmethod
+    def iter_record_batches(
+        query: str, params: Optional[Dict] = None
+    ) -> Iterator["pa.RecordBatch"]:
+        """Execute a raw SQL query and yield its results as Arrow record
+        batches. Needs pyarrow, which is not installed by default."""
+        import pyarrow as pa
+        from pyarrow import csv
+
+        with copy_csv_stream(query, params) as (stream, columns):
+            convert_options = csv.ConvertOptions(
+                **_CSV_BOOLEANS,
+                null_values=[_CSV_NULL],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False,  # A quoted "\\N" is text
+                # Text stays text: no "00123" -> 123
+                column_types={
+                    name: pa.string()
+                    for name, type_code in columns
+                    if type_code
+                    not in _PG_BOOLEANS
+                    | _PG_INTEGERS
+                    | _PG_FLOATS
+                    | _PG_TIMESTAMPS
+                    | _PG_TIMESTAMPTZ
+                },
+            )
+            yield from csv.open_csv(
+                stream,
+                read_options=csv.ReadOptions(block_size=DB_COPY_BUFFER_BYTES),
+                convert_options=convert_options,
+            )
 
     @staticmethod
     def execute_query(
@@ -196,6 +445,35 @@ class DatabaseModel(BaseModel):
             result = conn.execute(text(query), params or {})
             return [dict(row._mapping) for row in result]
 
+    @staticmethod
+    async def execute_queries_concurrently(
+        *queries: Tuple[str, Optional[Dict]],
+    ) -> List[List[Dict[str, Any]]]:
+        """Run independent read queries at the same time, each on its own
+        pooled connection, and return their results in the same order.
+
+        For handlers that need several unrelated reads: the wait is the
+        slowest query instead of the sum of all of them.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(DatabaseModel.execute_query, query, params)
+                    for query, params in queries
+                )
+            )
+        )
+
+    @staticmethod
+    def execute_in_transaction(*statements: Tuple[str, Optional[Dict]]) -> List[int]:
+        """Run write statements in order in one transaction, committing only if
+        all of them succeed, and return their row counts"""
+        with engine.begin() as conn:
+            return [
+                conn.execute(text(statement), params or {}).rowcount
+                for statement, params in statements
+            ]
+
     @staticmethod
     def insert_record(table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a record into the specified table"""
@@ -0,0 +1,158 @@
+import logging
+from datetime import date
+from typing import Any, Optional
+
+from utils.db import DatabaseModel
+
+logger = logging.getLogger(__name__)
+
+# gym_daily_stats holds one row per user and day with that day's activity
+# count, sets, reps (sets * reps), tonnage (sets * reps * weight) and volume
+# per muscle (sets * reps * percentage), so dashboards read one row per day
+# instead of every logged set. Writes refresh the day they touch, and changing
+# an exercise's muscles_trained refreshes every day it was logged; the whole
+# table can be rebuilt from gym_activity with scripts/rebuild_gym_daily_stats.py.
+
+_COLUMNS = "user_id, day, activities, sets, reps, tonnage, muscle_volume"
+
+
+def _aggregate_query(where: str) -> str:
+    """SELECT producing gym_daily_stats rows for the activities matching where"""
+    return f"""
+        WITH activity AS (
+            SELECT
+                ga.user_id,
+                DATE(ga.created_at) AS day,
+                ga.sets,
+                ga.reps,
+                ga.weight,
+                e.muscles_trained
+            FROM dradic_tech.gym_activity ga
+            JOIN dradic_tech.exercises e ON ga.exercise_id = e.id
+            WHERE {where}
+        ),
+        muscles AS (
+            SELECT
+                a.user_id,
+                a.day,
+                m.key AS muscle,
+                SUM(a.sets * a.reps * m.value::numeric / 100) AS volume
+            FROM activity a
+            CROSS JOIN LATERAL jsonb_each(a.muscles_trained) m
+            GROUP BY a.user_id, a.day, m.key
+        )
+        SELECT
+            a.user_id,
+            a.day,
+            COUNT(*) AS activities,
+            SUM(a.sets) AS sets,
+            SUM(a.sets * a.reps) AS reps,
+            SUM(a.sets * a.reps * COALESCE(a.weight, 0)) AS tonnage,
+            COALESCE((
+                SELECT jsonb_object_agg(m.muscle, m.volume)
+                FROM muscles m
+                WHERE m.user_id = a.user_id AND m.day = a.day
+            ), '{{}}'::jsonb) AS muscle_volume
+        FROM activity a
+        GROUP BY a.user_id, a.day
+    """
+
+
+_REFRESH_DAY_DELETE = """
+    DELETE FROM dradic_tech.gym_daily_stats
+    WHERE user_id = :user_id AND day = CAST(:day AS date)
+"""
+
+_REFRESH_DAY_WHERE = """
+    ga.user_id = :user_id
+    AND ga.created_at >= CAST(:day AS date)
+    AND ga.created_at < CAST(:day AS date) + 1
+"""
+
+_ON_CONFLICT = """
+    ON CONFLICT (user_id, day) DO UPDATE SET
+        activities = EXCLUDED.activities,
+        sets = EXCLUDED.sets,
+        reps = EXCLUDED.reps,
+        tonnage = EXCLUDED.tonnage,
+        muscle_volume = EXCLUDED.muscle_volume,
+        updated_at = NOW()
+"""
+
+_REFRESH_DAY_INSERT = f"""
+    INSERT INTO dradic_tech.gym_daily_stats ({_COLUMNS})
+    {_aggregate_query(_REFRESH_DAY_WHERE)}
+    {_ON_CONFLICT}
+"""
+
+# Every day with an activity of the exercise still has activities afterwards,
+# so upserting those days' rows is enough; none need deleting
+_REFRESH_EXERCISE_WHERE = """
+    (ga.user_id, DATE(ga.created_at)) IN (
+        SELECT user_id, DATE(created_at)
+        FROM dradic_tech.gym_activity
+        WHERE exercise_id = CAST(:exercise_id AS uuid)
+    )
+"""
+
+_REFRESH_EXERCISE_UPSERT = f"""
+    INSERT INTO dradic_tech.gym_daily_stats ({_COLUMNS})
+    {_aggregate_query(_REFRESH_EXERCISE_WHERE)}
+    {_ON_CONFLICT}
+"""
+
+
+def refresh_gym_daily_stats(user_id: Optional[str], day: date):
+    """Recompute a user's row for one day after an activity on that day is
+    created, updated or deleted.
+
+    Only that day's activities are read. Failures are logged rather than
+    raised, since the activity write has already been committed; the
+    rebuild script repairs any row that was missed.
+    """
+    if not user_id:
+        return
+    params = {"user_id": user_id, "day": str(day)}
+    try:
+        DatabaseModel.execute_in_transaction(
+            (_REFRESH_DAY_DELETE, params), (_REFRESH_DAY_INSERT, params)
+        )
+    except Exception as e:
+        logger.error(f"Failed to refresh gym daily stats for {day}: {str(e)}")
+
+
+def refresh_gym_daily_stats_for_exercise(exercise_id: Any):
+    """Recompute every user's rows for the days an exercise was logged, after
+    its muscles_trained changes, so their muscle volume follows the catalog.
+
+    Failures are logged rather than raised, like refresh_gym_daily_stats.
+    """
+    try:
+        DatabaseModel.execute_in_transaction(
+            (_REFRESH_EXERCISE_UPSERT, {"exercise_id": str(exercise_id)})
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to refresh gym daily stats for exercise {exercise_id}: {str(e)}"
+        )
+
+
+def rebuild_gym_daily_stats(user_id: Optional[str] = None) -> int:
+    """Recompute gym_daily_stats from gym_activity for one user, or for
+    everyone, in a single transaction; returns the number of rows written"""
+    if user_id:
+        delete = "DELETE FROM dradic_tech.gym_daily_stats WHERE user_id = :user_id"
+        where = "ga.user_id = :user_id"
+    else:
+        delete = "DELETE FROM dradic_tech.gym_daily_stats"
+        where = "TRUE"
+    insert = f"""
+        INSERT INTO dradic_tech.gym_daily_stats ({_COLUMNS})
+        {_aggregate_query(where)}
+    """
+
+    params = {"user_id": user_id}
+    _, written = DatabaseModel.execute_in_transaction(
+        (delete, params), (insert, params)
+    )
+    return written
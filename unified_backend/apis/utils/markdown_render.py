@@ -0,0 +1,56 @@
+import functools
+import hashlib
+import os
+from typing import Callable
+
+from utils.cache import LRUCache
+
+# Rendered HTML kept in-process, keyed by a hash of the markdown it came from
+BLOG_HTML_CACHE_MAX_ENTRIES = int(os.getenv("BLOG_HTML_CACHE_MAX_ENTRIES", "512"))
+
+_html_cache = LRUCache(max_entries=BLOG_HTML_CACHE_MAX_ENTRIES)
+
+
+@functools.cache
+def _renderer() -> Callable[[str], str]:
+    """Build the markdown renderer on first use, keeping its imports off startup"""
+    import nh3
+    from markdown_it import MarkdownIt
+
+    # CommonMark plus the GFM tables and strikethrough the frontend renders with
+    # remark-gfm. Raw HTML in posts is escaped, like react-markdown does by default.
+    markdown = MarkdownIt("commonmark", {"html": False}).enable(
+        ["table", "strikethrough"]
+    )
+
+    # Keep syntax highlighting hints on fenced code blocks
+    allowed_attributes = {**nh3.ALLOWED_ATTRIBUTES, "code": {"class"}}
+
+    def render(source: str) -> str:
+        return nh3.clean(
+            markdown.render(source),
+            attributes=allowed_attributes,
+            link_rel="noopener noreferrer nofollow",
+        )
+
+    return render
+
+
+def content_hash(markdown: str) -> str:
+    """Return the SHA-256 hex digest identifying a markdown document"""
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+def render_markdown(markdown: str) -> str:
+    """Render markdown to sanitized HTML, without caching"""
+    return _renderer()(markdown)
+
+
+def get_rendered_html(markdown: str) -> str:
+    """Return sanitized HTML for markdown, rendering once per distinct content"""
+    key = content_hash(markdown)
+    html = _html_cache.get(key)
+    if html is None:
+        html = render_markdown(markdown)
+        _html_cache.set(key, html)
+    return html
@@ -0,0 +1,55 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class LatencyStats:
+    """Thread-safe per-operation latency counters.
+
+    Keeps count, error count, total and max for every operation, plus a
+    bounded window of recent samples for percentiles.
+    """
+
+    def __init__(self, window: int = 512):
+        self._window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, operation: str, seconds: float, error: bool = False):
+        """Record one call of operation that took seconds"""
+        with self._lock:
+            counters = self._counters.setdefault(
+                operation, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0}
+            )
+            counters["count"] += 1
+            counters["total"] += seconds
+            counters["max"] = max(counters["max"], seconds)
+            if error:
+                counters["errors"] += 1
+
+            samples = self._samples.setdefault(operation, deque(maxlen=self._window))
+            samples.append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters in milliseconds, keyed by operation"""
+        with self._lock:
+            result = {}
+            for operation, counters in self._counters.items():
+                samples = sorted(self._samples[operation])
+                result[operation] = {
+                    "count": int(counters["count"]),
+                    "errors": int(counters["errors"]),
+                    "avg_ms": round(counters["total"] / counters["count"] * 1000, 2),
+                    "p50_ms": round(_percentile(samples, 0.50) * 1000, 2),
+                    "p95_ms": round(_percentile(samples, 0.95) * 1000, 2),
+                    "max_ms": round(counters["max"] * 1000, 2),
+                }
+            return result
+
+
+def _percentile(sorted_samples: list, fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(int(len(sorted_samples) * fraction), len(sorted_samples) - 1)
+    return sorted_samples[index]
@@ -0,0 +1,186 @@
+import logging
+from typing import Any, Dict, Optional
+
+from utils.db import DatabaseModel
+
+logger = logging.getLogger(__name__)
+
+# personal_records holds one row per user and exercise with the best weighted
+# set by weight, by estimated one-rep max and by set volume (reps * weight),
+# each with the activity that set it and when. A new or edited activity is
+# compared against the stored row in one upsert; only removing or lowering
+# the activity that holds a record reads the exercise's history again.
+
+# Record name -> columns copied from the activity that beats it
+_RECORDS = {
+    "best_weight": ("best_weight", "best_weight_reps"),
+    "best_one_rep_max": ("best_one_rep_max",),
+    "best_set_volume": ("best_set_volume",),
+}
+
+_COLUMNS = ["user_id", "exercise_id"] + [
+    column
+    for record, values in _RECORDS.items()
+    for column in (*values, f"{record}_activity_id", f"{record}_at")
+]
+
+_INSERT = f"""
+    INSERT INTO dradic_tech.personal_records AS pr ({", ".join(_COLUMNS)})
+    VALUES ({", ".join(f":{column}" for column in _COLUMNS)})
+"""
+
+# Each record's columns move together, and only when the new value is higher,
+# so ties keep the earlier activity
+_APPLY_ACTIVITY = (
+    _INSERT
+    + "ON CONFLICT (user_id, exercise_id) DO UPDATE SET "
+    + ", ".join(
+        f"{column} = CASE WHEN EXCLUDED.{record} > pr.{record} "
+        f"THEN EXCLUDED.{column} ELSE pr.{column} END"
+        for record, values in _RECORDS.items()
+        for column in (*values, f"{record}_activity_id", f"{record}_at")
+    )
+    + ", updated_at = NOW()"
+)
+
+_REPLACE = (
+    _INSERT
+    + "ON CONFLICT (user_id, exercise_id) DO UPDATE SET "
+    + ", ".join(f"{column} = EXCLUDED.{column}" for column in _COLUMNS[2:])
+    + ", updated_at = NOW()"
+)
+
+_DELETE = """
+    DELETE FROM dradic_tech.personal_records
+    WHERE user_id = :user_id AND exercise_id = :exercise_id
+"""
+
+_HOLDS_RECORD = """
+    SELECT 1 FROM dradic_tech.personal_records
+    WHERE user_id = :user_id AND exercise_id = :exercise_id
+    AND CAST(:activity_id AS uuid) IN (
+        best_weight_activity_id,
+        best_one_rep_max_activity_id,
+        best_set_volume_activity_id
+    )
+"""
+
+
+def estimate_one_rep_max(weight: float, reps: float) -> float:
+    """Estimated one-rep max for a set: Brzycki up to 10 reps, Epley above,
+    where Brzycki overestimates; the two agree at exactly 10 reps"""
+    if reps <= 1:
+        return float(weight)
+    if reps <= 10:
+        return weight * 36 / (37 - reps)
+    return weight * (1 + reps / 30)
+
+
+def _candidate(activity: Dict[str, Any]) -> Dict[str, Any]:
+    """The record values a single weighted activity would set"""
+    weight = float(activity["weight"])
+    reps = float(activity["reps"])
+    values = {
+        "best_weight": weight,
+        "best_weight_reps": reps,
+        "best_one_rep_max": estimate_one_rep_max(weight, reps),
+        "best_set_volume": reps * weight,
+    }
+    for record in _RECORDS:
+        values[f"{record}_activity_id"] = str(activity["id"])
+        values[f"{record}_at"] = activity["created_at"]
+    return values
+
+
+def _params(user_id: str, exercise_id: Any, values: Dict[str, Any]) -> Dict:
+    return {"user_id": user_id, "exercise_id": str(exercise_id), **values}
+
+
+def _holds_record(user_id: str, exercise_id: Any, activity_id: Any) -> bool:
+    """Whether the activity currently holds any of the exercise's records"""
+    rows = DatabaseModel.execute_query(
+        _HOLDS_RECORD,
+        {
+            "user_id": user_id,
+            "exercise_id": str(exercise_id),
+            "activity_id": str(activity_id),
+        },
+    )
+    return bool(rows)
+
+
+def recompute_personal_records(user_id: str, exercise_id: Any):
+    """Rebuild a user's records for one exercise from all its weighted
+    activities, removing the row when none are left"""
+    activities = DatabaseModel.execute_query(
+        """
+        SELECT id, reps, weight, created_at
+        FROM dradic_tech.gym_activity
+        WHERE user_id = :user_id AND exercise_id = :exercise_id
+        AND weight IS NOT NULL
+        ORDER BY created_at
+        """,
+        {"user_id": user_id, "exercise_id": str(exercise_id)},
+    )
+
+    best: Dict[str, Any] = {}
+    for activity in activities:
+        candidate = _candidate(activity)
+        for record, values in _RECORDS.items():
+            # Strictly greater, so the earliest of equal sets keeps the record
+            if record not in best or candidate[record] > best[record]:
+                for column in (*values, f"{record}_activity_id", f"{record}_at"):
+                    best[column] = candidate[column]
+
+    statement = _REPLACE if best else _DELETE
+    DatabaseModel.execute_in_transaction(
+        (statement, _params(user_id, exercise_id, best))
+    )
+
+
+def record_activity(user_id: Optional[str], activity: Dict[str, Any]):
+    """Update records after an activity is logged, in one upsert"""
+    if not user_id or activity.get("weight") is None:
+        return
+    try:
+        DatabaseModel.execute_in_transaction(
+            (
+                _APPLY_ACTIVITY,
+                _params(user_id, activity["exercise_id"], _candidate(activity)),
+            )
+        )
+    except Exception as e:
+        logger.error(f"Failed to update personal records: {str(e)}")
+
+
+def record_activity_update(
+    user_id: Optional[str], previous_exercise_id: Any, activity: Dict[str, Any]
+):
+    """Update records after an activity is edited.
+
+    Higher values are applied like a new activity. If the activity held one
+    of its previous exercise's records, that exercise is recomputed instead,
+    since the edit may have lowered or moved the record.
+    """
+    if not user_id:
+        return
+    try:
+        if _holds_record(user_id, previous_exercise_id, activity["id"]):
+            recompute_personal_records(user_id, previous_exercise_id)
+            if str(previous_exercise_id) == str(activity["exercise_id"]):
+                return
+        record_activity(user_id, activity)
+    except Exception as e:
+        logger.error(f"Failed to update personal records: {str(e)}")
+
+
+def record_activity_deletion(user_id: Optional[str], activity: Dict[str, Any]):
+    """Update records after an activity is deleted, recomputing the exercise
+    only when the deleted activity held one of its records"""
+    if not user_id:
+        return
+    try:
+        if _holds_record(user_id, activity["exercise_id"], activity["id"]):
+            recompute_personal_records(user_id, activity["exercise_id"])
+    except Exception as e:
+        logger.error(f"Failed to update personal records: {str(e)}")
@@ -0,0 +1,269 @@
+import bisect
+import heapq
+import html
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+# BM25 tuning
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Matches in these fields count as this many occurrences in the body
+FIELD_WEIGHTS = {"title": 3.0, "category": 2.0, "author": 2.0, "body": 1.0}
+
+# Terms that only match the typeahead prefix score lower than exact matches
+PREFIX_MATCH_WEIGHT = 0.7
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 16
+
+SNIPPET_LENGTH = 200
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_MARKDOWN_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MARKDOWN_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_MARKDOWN_SYNTAX_RE = re.compile(r"[#*_`>~|]+|-{3,}|^\s*[-+]\s+", re.MULTILINE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercased word tokens"""
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def markdown_to_text(markdown: str) -> str:
+    """Reduce markdown to plain text for indexing and snippets"""
+    text = _MARKDOWN_IMAGE_RE.sub(" ", markdown)
+    text = _MARKDOWN_LINK_RE.sub(r"\1", text)
+    text = _MARKDOWN_SYNTAX_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+@dataclass
+class _IndexedDocument:
+    slug: str
+    version: Optional[str]
+    metadata: Dict[str, str]
+    text: str
+    term_weights: Dict[str, float]
+    length: float
+
+
+class BlogSearchIndex:
+    """In-memory inverted index over blog posts with BM25 ranking.
+
+    Title, category, author and body are indexed together, with per-field
+    weights applied to term frequencies. Documents are added, replaced and
+    removed one at a time, so the index is maintained incrementally. The last
+    query term also matches as a prefix, for typeahead.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._documents: Dict[str, _IndexedDocument] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: List[str] = []  # Sorted, for prefix lookups
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._documents)
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        """Return the indexed version (ETag) of every document, keyed by slug"""
+        with self._lock:
+            return {slug: doc.version for slug, doc in self._documents.items()}
+
+    def add(
+        self,
+        slug: str,
+        metadata: Dict[str, str],
+        body: str,
+        version: Optional[str] = None,
+    ):
+        """Index a post, replacing any previous version of it"""
+        text = markdown_to_text(body)
+        fields = {
+            "title": metadata.get("title", ""),
+            "category": metadata.get("category", ""),
+            "author": metadata.get("author", ""),
+            "body": text,
+        }
+
+        term_weights: Dict[str, float] = {}
+        for field, value in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for term, count in Counter(tokenize(value)).items():
+                term_weights[term] = term_weights.get(term, 0.0) + count * weight
+
+        document = _IndexedDocument(
+            slug=slug,
+            version=version,
+            metadata=dict(metadata),
+            text=text,
+            term_weights=term_weights,
+            length=sum(term_weights.values()),
+        )
+
+        with self._lock:
+            self._remove(slug)
+            self._documents[slug] = document
+            self._total_length += document.length
+            for term, weight in term_weights.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    bisect.insort(self._terms, term)
+                postings[slug] = weight
+
+    def remove(self, slug: str):
+        """Drop a post from the index"""
+        with self._lock:
+            self._remove(slug)
+
+    def _remove(self, slug: str):
+        document = self._documents.pop(slug, None)
+        if document is None:
+            return
+
+        self._total_length -= document.length
+        for term in document.term_weights:
+            postings = self._postings[term]
+            del postings[slug]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the best matching posts for query with highlighted snippets"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Typeahead: the last term also matches as a prefix while it's being typed
+        prefix = terms[-1] if not query[-1:].isspace() else None
+
+        with self._lock:
+            if not self._documents:
+                return []
+
+            document_count = len(self._documents)
+            average_length = self._total_length / document_count or 1.0
+            scores: Dict[str, float] = {}
+            matched_terms: Set[str] = set()
+            # BM25 length normalization per document, filled in on first use
+            normalizations: Dict[str, float] = {}
+
+            for term in dict.fromkeys(terms):
+                expansions = {term: 1.0}
+                if term == prefix and len(term) >= MIN_PREFIX_LENGTH:
+                    for expansion in self._expand_prefix(term):
+                        expansions.setdefault(expansion, PREFIX_MATCH_WEIGHT)
+
+                # A query term scores each document by its best matching expansion
+                term_scores: Dict[str, float] = {}
+                for expansion, weight in expansions.items():
+                    postings = self._postings.get(expansion)
+                    if not postings:
+                        continue
+
+                    matched_terms.add(expansion)
+                    factor = (
+                        weight * _idf(document_count, len(postings)) * (BM25_K1 + 1)
+                    )
+                    for slug, frequency in postings.items():
+                        normalization = normalizations.get(slug)
+                        if normalization is None:
+                            length = self._documents[slug].length
+                            normalization = normalizations[slug] = BM25_K1 * (
+                                1 - BM25_B + BM25_B * length / average_length
+                            )
+                        score = factor * frequency / (frequency + normalization)
+                        if score > term_scores.get(slug, 0.0):
+                            term_scores[slug] = score
+
+                for slug, score in term_scores.items():
+                    scores[slug] = scores.get(slug, 0.0) + score
+
+            top = heapq.nlargest(
+                limit, scores.items(), key=lambda item: (item[1], item[0])
+            )
+            documents = [(self._documents[slug], score) for slug, score in top]
+
+        pattern = match_pattern(matched_terms)
+        return [
+            {
+                "slug": document.slug,
+                "metadata": document.metadata,
+                "score": round(score, 4),
+                "title_highlighted": highlight(
+                    document.metadata.get("title", ""), pattern
+                ),
+                "snippet": make_snippet(document.text, pattern),
+            }
+            for document, score in documents
+        ]
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        expansions = []
+        for term in self._terms[start : start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+
+def _idf(document_count: int, document_frequency: int) -> float:
+    return math.log(
+        1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5)
+    )
+
+
+def match_pattern(terms: Set[str]) -> Optional[re.Pattern]:
+    """Compile a case-insensitive regex matching any of terms as whole words"""
+    if not terms:
+        return None
+    alternatives = "|".join(
+        re.escape(term) for term in sorted(terms, key=len, reverse=True)
+    )
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)", re.IGNORECASE)
+
+
+def highlight(text: str, pattern: Optional[re.Pattern]) -> str:
+    """HTML-escape text and wrap matches of pattern in <mark>"""
+    if pattern is None:
+        return html.escape(text)
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[position : match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
+
+
+def make_snippet(
+    text: str, pattern: Optional[re.Pattern], length: int = SNIPPET_LENGTH
+) -> str:
+    """Return a highlighted window of text around the first match of pattern"""
+    match = pattern.search(text) if pattern else None
+    first_match = match.start() if match else 0
+
+    start = max(first_match - length // 4, 0)
+    if start:
+        # Don't cut the first word in half
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < first_match else start
+    end = min(start + length, len(text))
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > first_match else end
+
+    snippet = highlight(text[start:end], pattern)
+    return f"{'…' if start else ''}{snippet}{'…' if end < len(text) else ''}"
@@ -0,0 +1,300 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from utils.cache import LRUCache
+from utils.db import DatabaseModel
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Each worker keeps a user's expenses and incomes in memory as columns, plus
+# the trend reports computed from them. Writes through this worker invalidate
+# the user's entry; other workers pick changes up after the TTL.
+ANALYTICS_CACHE_MAX_USERS = int(os.getenv("ANALYTICS_CACHE_MAX_USERS", "256"))
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "600"))
+
+# Weekly rolling averages span this many weeks
+WEEKLY_WINDOW = 4
+
+_EXPENSES_QUERY = """
+    SELECT
+        e.date,
+        e.amount,
+        e.currency,
+        COALESCE(ei.category, 'Uncategorized') AS category
+    FROM dradic_tech.expenses e
+    JOIN dradic_tech.expense_items ei ON e.item_id = ei.id
+    WHERE ei.user_id = :user_id
+"""
+
+_INCOMES_QUERY = """
+    SELECT i.date, i.amount, i.currency
+    FROM dradic_tech.incomes i
+    JOIN dradic_tech.income_sources ins ON i.source_id = ins.id
+    WHERE ins.user_id = :user_id
+"""
+
+
+@dataclass
+class UserLedger:
+    """A user's expenses and incomes as columns, and reports built from them"""
+
+    expenses: "pd.DataFrame"
+    incomes: "pd.DataFrame"
+    reports: LRUCache = field(default_factory=lambda: LRUCache(max_entries=32))
+
+
+_ledgers = LRUCache(
+    max_entries=ANALYTICS_CACHE_MAX_USERS, ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS
+)
+# Bumped on every invalidation, so a load that raced a write isn't cached
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+
+def invalidate_user_analytics(user_id: Optional[str]):
+    """Drop a user's cached ledger after their expenses or incomes change"""
+    if not user_id:
+        return
+    with _generations_lock:
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+    _ledgers.pop(user_id)
+
+
+def _load_ledger(user_id: str) -> UserLedger:
+    read_options = {
+        "parse_dates": ["date"],
+        "dtype": {"amount": "float64"},
+    }
+    expenses = DatabaseModel.fetch_as_dataframe(
+        _EXPENSES_QUERY, {"user_id": user_id}, **read_options
+    )
+    incomes = DatabaseModel.fetch_as_dataframe(
+        _INCOMES_QUERY, {"user_id": user_id}, **read_options
+    )
+    return UserLedger(expenses=expenses, incomes=incomes)
+
+
+def get_user_ledger(user_id: str) -> UserLedger:
+    """Return a user's ledger, loading it with two bulk reads when not cached"""
+    ledger = _ledgers.get(user_id)
+    if ledger is not None:
+        return ledger
+
+    with _generations_lock:
+        generation = _generations.get(user_id, 0)
+    ledger = _load_ledger(user_id)
+    with _generations_lock:
+        if _generations.get(user_id, 0) == generation:
+            _ledgers.set(user_id, ledger)
+    return ledger
+
+
+def month_index(year: int, month: int) -> int:
+    """Months since 1970-01, the integer value of numpy's datetime64[M]"""
+    return (year - 1970) * 12 + month - 1
+
+
+def _month_label(index: int) -> str:
+    year, month = divmod(index, 12)
+    return f"{year + 1970:04d}-{month + 1:02d}"
+
+
+def _months_of(dates: "pd.Series") -> "np.ndarray":
+    return dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]").astype(int)
+
+
+def _weeks_of(dates: "pd.Series") -> "np.ndarray":
+    # Day 0 (1970-01-01) was a Thursday, so weeks counted this way start on
+    # Monday, with week 0 starting 1969-12-29
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(int)
+    return (days + 3) // 7
+
+
+def _totals(
+    buckets: "np.ndarray", amounts: "np.ndarray", first: int, length: int
+) -> "np.ndarray":
+    """Sum amounts into length consecutive buckets starting at first"""
+    import numpy as np
+
+    offsets = buckets - first
+    inside = (offsets >= 0) & (offsets < length)
+    totals = np.bincount(offsets[inside], weights=amounts[inside], minlength=length)
+    # bincount returns integers when there is nothing to count
+    return totals.astype("float64", copy=False)
+
+
+def _rolling_mean(values: "np.ndarray", window: int) -> "np.ndarray":
+    """Trailing mean over window buckets; values must include window - 1
+    buckets of history before the first one reported"""
+    import numpy as np
+
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return (cumulative[window:] - cumulative[:-window]) / window
+
+
+def _ratio(numerator: "np.ndarray", denominator: "np.ndarray") -> List[Optional[float]]:
+    """numerator / denominator, None where the denominator is zero"""
+    import numpy as np
+
+    safe = np.where(denominator != 0, denominator, 1.0)
+    result = np.round(numerator / safe, 4)
+    return [
+        float(value) if valid else None
+        for value, valid in zip(result, denominator != 0, strict=True)
+    ]
+
+
+def _rounded(values: "np.ndarray") -> List[float]:
+    import numpy as np
+
+    return np.round(values, 2).tolist()
+
+
+def build_trends(
+    ledger: UserLedger, currency: str, first_month: int, last_month: int, window: int
+) -> Dict[str, Any]:
+    """Monthly, weekly and per-category series for first_month..last_month
+    (inclusive month indexes), in one pass over each column"""
+    import numpy as np
+    import pandas as pd
+
+    expenses = ledger.expenses[ledger.expenses["currency"] == currency]
+    incomes = ledger.incomes[ledger.incomes["currency"] == currency]
+    expense_amounts = expenses["amount"].to_numpy(dtype="float64")
+    income_amounts = incomes["amount"].to_numpy(dtype="float64")
+    expense_months = _months_of(expenses["date"])
+    income_months = _months_of(incomes["date"])
+
+    # Monthly totals with enough history for the rolling mean and for YoY
+    span = last_month - first_month + 1
+    history = max(12, window - 1)
+    start = first_month - history
+    monthly_expenses = _totals(expense_months, expense_amounts, start, span + history)
+    monthly_income = _totals(income_months, income_amounts, start, span + history)
+
+    current = slice(history, None)
+    year_ago = slice(history - 12, history - 12 + span)
+    expenses_now = monthly_expenses[current]
+    income_now = monthly_income[current]
+    savings = income_now - expenses_now
+    expenses_avg = _rolling_mean(monthly_expenses[history - window + 1 :], window)
+    income_avg = _rolling_mean(monthly_income[history - window + 1 :], window)
+    expenses_last_year = monthly_expenses[year_ago]
+    income_last_year = monthly_income[year_ago]
+
+    expenses_yoy = _ratio(expenses_now - expenses_last_year, expenses_last_year)
+    income_yoy = _ratio(income_now - income_last_year, income_last_year)
+    savings_rate = _ratio(savings, income_now)
+    months = [
+        {
+            "month": _month_label(first_month + offset),
+            "expenses": float(round(expenses_now[offset], 2)),
+            "income": float(round(income_now[offset], 2)),
+            "savings": float(round(savings[offset], 2)),
+            "savings_rate": savings_rate[offset],
+            "expenses_avg": float(round(expenses_avg[offset], 2)),
+            "income_avg": float(round(income_avg[offset], 2)),
+            "expenses_yoy": expenses_yoy[offset],
+            "income_yoy": income_yoy[offset],
+        }
+        for offset in range(span)
+    ]
+
+    # Weekly totals for every week overlapping the range
+    first_day = np.datetime64(_month_label(first_month), "D").astype(int)
+    last_day = np.datetime64(_month_label(last_month + 1), "D").astype(int) - 1
+    first_week = (first_day + 3) // 7
+    week_span = (last_day + 3) // 7 - first_week + 1
+    week_start = first_week - (WEEKLY_WINDOW - 1)
+    weekly_expenses = _totals(
+        _weeks_of(expenses["date"]),
+        expense_amounts,
+        week_start,
+        week_span + WEEKLY_WINDOW - 1,
+    )
+    weekly_income = _totals(
+        _weeks_of(incomes["date"]),
+        income_amounts,
+        week_start,
+        week_span + WEEKLY_WINDOW - 1,
+    )
+    weekly_expenses_avg = _rolling_mean(weekly_expenses, WEEKLY_WINDOW)
+    week_starts = (
+        ((first_week + np.arange(week_span)) * 7 - 3).astype("datetime64[D]").tolist()
+    )
+    weeks = [
+        {
+            "week_start": week_starts[offset],
+            "expenses": float(round(weekly_expenses[WEEKLY_WINDOW - 1 + offset], 2)),
+            "income": float(round(weekly_income[WEEKLY_WINDOW - 1 + offset], 2)),
+            "expenses_avg": float(round(weekly_expenses_avg[offset], 2)),
+        }
+        for offset in range(week_span)
+    ]
+
+    # Category x month totals in a single bincount over a combined index
+    in_range = (expense_months >= first_month) & (expense_months <= last_month)
+    codes, names = pd.factorize(expenses["category"].to_numpy()[in_range], sort=True)
+    cells = _totals(
+        codes * span + (expense_months[in_range] - first_month),
+        expense_amounts[in_range],
+        0,
+        len(names) * span,
+    ).reshape(len(names), span)
+    category_totals = cells.sum(axis=1)
+    total_expenses = float(expenses_now.sum())
+    total_income = float(income_now.sum())
+    monthly_shares = np.divide(
+        cells, expenses_now, out=np.zeros_like(cells), where=expenses_now != 0
+    )
+    categories = [
+        {
+            "category": str(names[row]),
+            "total": float(round(category_totals[row], 2)),
+            "share": round(float(category_totals[row]) / total_expenses, 4)
+            if total_expenses
+            else 0.0,
+            "monthly": _rounded(cells[row]),
+            "monthly_share": np.round(monthly_shares[row], 4).tolist(),
+        }
+        for row in np.argsort(-category_totals, kind="stable")
+    ]
+
+    return {
+        "currency": currency,
+        "start_month": _month_label(first_month),
+        "end_month": _month_label(last_month),
+        "window": window,
+        "total_expenses": round(total_expenses, 2),
+        "total_income": round(total_income, 2),
+        "total_savings": round(total_income - total_expenses, 2),
+        "savings_rate": round((total_income - total_expenses) / total_income, 4)
+        if total_income
+        else None,
+        "months": months,
+        "weeks": weeks,
+        "categories": categories,
+    }
+
+
+def get_trends(
+    user_id: str, currency: str, months: int, window: int, end: Optional[date] = None
+) -> Dict[str, Any]:
+    """Trend report for the months ending with end's month (default: this
+    month), computed once per ledger and cached alongside it"""
+    end = end or date.today()
+    last_month = month_index(end.year, end.month)
+    first_month = last_month - months + 1
+
+    ledger = get_user_ledger(user_id)
+    key = (currency, first_month, last_month, window)
+    report = ledger.reports.get(key)
+    if report is None:
+        report = build_trends(ledger, currency, first_month, last_month, window)
+        ledger.reports.set(key, report)
+    return report
@@ -1,25 +1,124 @@
+import json
 import os
-import boto3
-from typing import List, Optional, Dict, Any
-from supabase import create_client, Client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Union
 import logging
-from botocore.exceptions import ClientError
+
+from utils.blog_summary import SUMMARY_FIELDS, parse_summary_fields, summarize_post
+from utils.bucket_index import BucketKeyIndex
+from utils.cache import LRUCache
+from utils.search_index import BlogSearchIndex
+from utils.storage import (
+    ByteRange,
+    LocalFilesystemBackend,
+    NotModified,
+    ObjectInfo,
+    ObjectNotFound,
+    ObjectResponse,
+    PreconditionFailed,
+    S3StorageBackend,
+    StorageBackend,
+    StorageError,
+    SupabaseStorageBackend,
+    get_shared_s3_client,
+    storage_latency,
+)
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# Which storage backend serves the bucket: "s3", "supabase" or "local". Left
+# empty, S3 is used when storage credentials are set and the Supabase Storage
+# API otherwise. "local" serves files from LOCAL_STORAGE_ROOT and needs no
+# Supabase credentials, which is useful for benchmarks and offline work.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "").lower()
+LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", "./storage")
+
+# Parsed blog posts kept in-process; entries are revalidated against storage
+# with their ETag once they are older than the TTL
+BLOG_CACHE_MAX_ENTRIES = int(os.getenv("BLOG_CACHE_MAX_ENTRIES", "256"))
+BLOG_CACHE_TTL_SECONDS = float(os.getenv("BLOG_CACHE_TTL_SECONDS", "60"))
+
+BLOG_POSTS_PREFIX = "blog_posts/"
+
+# Metadata and precomputed summaries of every post, so listings don't need
+# to download post bodies. Written with conditional puts on every change.
+BLOG_MANIFEST_KEY = f"{BLOG_POSTS_PREFIX}index.json"
+BLOG_MANIFEST_WRITE_ATTEMPTS = 3
+
+# Seconds before the in-memory bucket key index used by /api/files is reloaded
+FILE_INDEX_TTL_SECONDS = float(os.getenv("FILE_INDEX_TTL_SECONDS", "300"))
+
+# Lifetime of presigned download URLs, and how long before expiry a cached URL
+# stops being handed out
+PRESIGNED_URL_TTL_SECONDS = int(os.getenv("PRESIGNED_URL_TTL_SECONDS", "900"))
+PRESIGNED_URL_REFRESH_MARGIN_SECONDS = int(
+    os.getenv("PRESIGNED_URL_REFRESH_MARGIN_SECONDS", "60")
+)
+
+# Chunk size used when streaming object bodies to clients
+FILE_STREAM_CHUNK_SIZE = int(os.getenv("FILE_STREAM_CHUNK_SIZE", str(64 * 1024)))
+
+# Maximum number of blog posts fetched from storage at the same time
+BLOG_FETCH_CONCURRENCY = int(os.getenv("BLOG_FETCH_CONCURRENCY", "8"))
+
+# Seconds between reconciling the blog search index with storage. Writes made
+# through this process update the index immediately; this picks up the rest.
+SEARCH_INDEX_SYNC_SECONDS = float(os.getenv("SEARCH_INDEX_SYNC_SECONDS", "300"))
+
+
+@dataclass
+class CachedBlogPost:
+    slug: str
+    content: str  # Full markdown including frontmatter
+    metadata: Dict[str, Any]  # Frontmatter plus excerpt/word_count/reading_time/outline
+    body: str  # Pure markdown content without frontmatter
+    etag: Optional[str]
+    validated_at: float
+
 
 class SupabaseService:
     def __init__(self):
         self._initialized = False
-        self._s3_client = None
-        self._supabase: Optional[Client] = None
+        self._init_lock = threading.Lock()
+        self._supabase: Optional["Client"] = None
         self._bucket_name = "dradic-technologies"
+        self._storage: Optional[StorageBackend] = None
+        self._fallback_storage: Optional[StorageBackend] = None
+        self._blog_cache = LRUCache(max_entries=BLOG_CACHE_MAX_ENTRIES)
+        self._fetch_executor: Optional[ThreadPoolExecutor] = None
+        self._presigned_urls = LRUCache(max_entries=1024)
+        self._key_index = BucketKeyIndex(
+            lambda: self.iter_object_keys(include_details=True),
+            ttl_seconds=FILE_INDEX_TTL_SECONDS,
+        )
+        self._search_index = BlogSearchIndex()
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._summaries_checked_at: Optional[float] = None
+        self._summaries_lock = threading.Lock()
+        self._search_synced_at: Optional[float] = None
+        self._search_sync_lock = threading.Lock()
 
     def initialize(self):
-        """Initialize Supabase client and S3 storage"""
+        """Initialize Supabase client and storage backend"""
         if self._initialized:
             return
 
+        with self._init_lock:
+            if not self._initialized:
+                self._initialize()
+
+    def _initialize(self):
+        # The supabase SDK is slow to import; load it with the first storage
+        # or auth call rather than at startup
+        from supabase import create_client
+
         try:
             # Get required environment variables
             supabase_url = os.getenv("SUPABASE_URL")
@@ -27,6 +126,19 @@ class SupabaseService:
             storage_access_key_id = os.getenv("SUPABASE_STORAGE_ACCESS_KEY_ID")
             storage_secret_access_key = os.getenv("SUPABASE_STORAGE_SECRET_ACCESS_KEY")
 
+            if STORAGE_BACKEND == "local":
+                self._storage = LocalFilesystemBackend(LOCAL_STORAGE_ROOT)
+                logger.info(
+                    f"Local filesystem storage initialized at {LOCAL_STORAGE_ROOT}"
+                )
+
+                # Auth still needs Supabase, but storage works without it
+                if supabase_url and supabase_service_key:
+                    self._supabase = create_client(supabase_url, supabase_service_key)
+
+                self._initialized = True
+                return
+
             # Validate required variables
             if not all([supabase_url, supabase_service_key]):
                 logger.error("Missing required Supabase environment variables")
@@ -36,26 +148,30 @@ class SupabaseService:
 
             # Initialize Supabase client
             self._supabase = create_client(supabase_url, supabase_service_key)
+            api_storage = SupabaseStorageBackend(self._supabase, self._bucket_name)
 
-            # Initialize S3 client for storage if credentials are provided
-            if storage_access_key_id and storage_secret_access_key:
+            # Use S3-compatible storage if credentials are provided, keeping the
+            # Storage API as a fallback
+            if STORAGE_BACKEND != "supabase" and (
+                storage_access_key_id and storage_secret_access_key
+            ):
                 # Extract project reference from Supabase URL for S3 endpoint
                 project_ref = supabase_url.split("//")[1].split(".")[0]
                 s3_endpoint = f"https://{project_ref}.supabase.co/storage/v1/s3"
 
-                self._s3_client = boto3.client(
-                    "s3",
-                    endpoint_url=s3_endpoint,
-                    aws_access_key_id=storage_access_key_id,
-                    aws_secret_access_key=storage_secret_access_key,
-                    region_name="us-east-1",  # Supabase uses us-east-1 for S3 compatibility
+                s3_client = get_shared_s3_client(
+                    s3_endpoint, storage_access_key_id, storage_secret_access_key
                 )
+                self._storage = S3StorageBackend(s3_client, self._bucket_name)
+                self._fallback_storage = api_storage
 
                 logger.info("S3-compatible storage initialized")
             else:
-                logger.warning(
-                    "Storage credentials not provided, storage features will be disabled"
-                )
+                if STORAGE_BACKEND == "s3":
+                    logger.warning(
+                        "Storage credentials not provided, using the Supabase Storage API"
+                    )
+                self._storage = api_storage
 
             self._initialized = True
             logger.info("Supabase service initialized successfully")
@@ -64,11 +180,42 @@ class SupabaseService:
             logger.error(f"Failed to initialize Supabase service: {e}")
             raise
 
+    @property
+    def storage(self) -> StorageBackend:
+        """The active storage backend"""
+        self.initialize()
+        return self._storage
+
+    def _call_storage(
+        self, description: str, operation: Callable[[StorageBackend], Any]
+    ):
+        """Run operation on the primary backend, retrying on the fallback.
+
+        Only generic backend failures are retried; not-found and precondition
+        outcomes are answers, not errors, and propagate unchanged.
+        """
+        storage = self.storage
+        try:
+            return operation(storage)
+        except StorageError as e:
+            if type(e) is not StorageError or self._fallback_storage is None:
+                raise
+            logger.error(f"Failed to {description} via {storage.name}: {e}")
+            try:
+                return operation(self._fallback_storage)
+            except Exception as fallback_e:
+                logger.error(f"Fallback to Supabase API also failed: {fallback_e}")
+                raise
+
     def verify_token(self, id_token: str) -> Optional[Dict[str, Any]]:
         """Verify Supabase JWT token and return user info"""
         try:
             self.initialize()
 
+            if not self._supabase:
+                logger.error("Supabase client is not configured, cannot verify token")
+                return None
+
             # Verify the JWT token using Supabase
             response = self._supabase.auth.get_user(id_token)
             user = response.user
@@ -89,159 +236,454 @@ class SupabaseService:
             return None
 
     def list_blog_posts(self) -> List[str]:
-        """List all blog post files in Supabase Storage"""
+        """List all blog post slugs in Supabase Storage"""
         try:
-            self.initialize()
+            return [self._blog_key_to_slug(key) for key in self.iter_blog_post_keys()]
+        except Exception as e:
+            logger.error(f"Failed to list blog posts: {e}")
+            raise
 
-            if not self._s3_client:
-                # Fallback to Supabase Storage API
-                files = self._supabase.storage.from_(self._bucket_name).list(
-                    "blog_posts"
-                )
-                return [
-                    f["name"].replace(".md", "")
-                    for f in files
-                    if f["name"].endswith(".md")
-                ]
+    def iter_blog_post_keys(
+        self, include_details: bool = False
+    ) -> Iterator[Union[str, Dict[str, Any]]]:
+        """Lazily yield blog post keys under the blog_posts/ prefix.
+
+        Pages through the listing, so it is not capped at 1000 keys. With
+        include_details, yields dicts with the key, size, etag and
+        last_modified instead of bare keys.
+        """
+        for obj in self.iter_object_keys(BLOG_POSTS_PREFIX, include_details=True):
+            if obj["key"].endswith(".md"):
+                yield obj if include_details else obj["key"]
+
+    def iter_object_keys(
+        self, prefix: str = "", include_details: bool = False
+    ) -> Iterator[Union[str, Dict[str, Any]]]:
+        """Lazily yield every key in the bucket under prefix, page by page"""
+        storage = self.storage
+        yielded = False
+        try:
+            for obj in storage.list(prefix):
+                yielded = True
+                yield obj.as_dict() if include_details else obj.key
+            return
+        except StorageError as e:
+            # Only fall back if nothing was yielded yet, to avoid duplicates
+            if type(e) is not StorageError or yielded or not self._fallback_storage:
+                raise
+            logger.error(f"Failed to list {prefix or 'bucket'} via {storage.name}: {e}")
 
-            # Use S3 API
-            response = self._s3_client.list_objects_v2(Bucket=self._bucket_name)
+        for obj in self._fallback_storage.list(prefix):
+            yield obj.as_dict() if include_details else obj.key
 
-            if "Contents" not in response:
-                return []
+    def find_file(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Resolve a filename query to a bucket object using the key index"""
+        return self._key_index.find(filename)
 
-            return [
-                obj["Key"].replace("blog_posts/", "").replace(".md", "")
-                for obj in response["Contents"]
-                if obj["Key"].endswith(".md")
-            ]
+    @staticmethod
+    def _blog_key_to_slug(key: str) -> str:
+        """Convert a blog_posts/<slug>.md object key into its slug"""
+        return key[len(BLOG_POSTS_PREFIX) :].removesuffix(".md")
 
-        except ClientError as e:
-            logger.error(f"Failed to list blog posts via S3: {e}")
-            # Fallback to Supabase Storage API
-            try:
-                files = self._supabase.storage.from_(self._bucket_name).list(
-                    "blog_posts"
-                )
-                return [
-                    f["name"].replace(".md", "")
-                    for f in files
-                    if f["name"].endswith(".md")
-                ]
-            except Exception as fallback_e:
-                logger.error(f"Fallback to Supabase API also failed: {fallback_e}")
-                raise
-        except Exception as e:
-            logger.error(f"Failed to list blog posts: {e}")
-            raise
+    @staticmethod
+    def _blog_key(slug: str) -> str:
+        return f"{BLOG_POSTS_PREFIX}{slug}.md"
 
     def get_blog_post_content(self, slug: str) -> Optional[str]:
         """Get blog post content from Supabase Storage"""
-        try:
-            self.initialize()
-
-            if not self._s3_client:
-                # Fallback to Supabase Storage API
-                response = self._supabase.storage.from_(self._bucket_name).download(
-                    f"blog_posts/{slug}.md"
-                )
-                return response.decode("utf-8") if response else None
+        post = self.get_blog_post(slug)
+        return post.content if post else None
+
+    def get_blog_post(
+        self, slug: str, revalidate: bool = False
+    ) -> Optional[CachedBlogPost]:
+        """Get a parsed blog post, serving from the in-process cache when fresh.
+
+        revalidate checks a cached copy against storage even within its TTL,
+        for callers that need the current ETag.
+        """
+        cached: Optional[CachedBlogPost] = self._blog_cache.get(slug)
+        if (
+            cached
+            and not revalidate
+            and time.monotonic() - cached.validated_at < BLOG_CACHE_TTL_SECONDS
+        ):
+            return cached
 
-            # Use S3 API
-            response = self._s3_client.get_object(
-                Bucket=self._bucket_name, Key=f"blog_posts/{slug}.md"
+        try:
+            # Revalidate the cached copy with its ETag
+            if_none_match = cached.etag if cached else None
+            response = self._call_storage(
+                f"get blog post {slug}",
+                lambda storage: storage.get(
+                    self._blog_key(slug), if_none_match=if_none_match
+                ),
+            )
+            return self._cache_blog_post(
+                slug, response.read().decode("utf-8"), response.etag
             )
-            return response["Body"].read().decode("utf-8")
 
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NoSuchKey":
-                return None
-            logger.error(f"Failed to get blog post {slug} via S3: {e}")
-            # Fallback to Supabase Storage API
-            try:
-                response = self._supabase.storage.from_(self._bucket_name).download(
-                    f"blog_posts/{slug}.md"
-                )
-                return response.decode("utf-8") if response else None
-            except Exception as fallback_e:
-                logger.error(f"Fallback to Supabase API also failed: {fallback_e}")
-                return None
+        except NotModified:
+            cached.validated_at = time.monotonic()
+            return cached
+        except ObjectNotFound:
+            self._blog_cache.pop(slug)
+            return None
         except Exception as e:
             logger.error(f"Failed to get blog post {slug}: {e}")
             return None
 
-    def upload_blog_post(self, slug: str, content: str) -> bool:
-        """Upload blog post to Supabase Storage"""
-        try:
-            self.initialize()
+    def get_blog_posts(self, slugs: List[str]) -> List[CachedBlogPost]:
+        """Fetch several blog posts concurrently, keeping the order of slugs.
 
-            if not self._s3_client:
-                # Fallback to Supabase Storage API
-                response = self._supabase.storage.from_(self._bucket_name).upload(
-                    f"blog_posts/{slug}.md",
-                    content.encode("utf-8"),
-                    file_options={"content-type": "text/markdown"},
-                )
-                return response is not None
-
-            # Use S3 API
-            self._s3_client.put_object(
-                Bucket=self._bucket_name,
-                Key=f"blog_posts/{slug}.md",
-                Body=content.encode("utf-8"),
-                ContentType="text/markdown",
+        Posts that are missing or fail to load are logged and left out instead
+        of failing the whole batch.
+        """
+        if not slugs:
+            return []
+
+        # Initialize once up front so worker threads don't race on client setup
+        self.initialize()
+
+        if self._fetch_executor is None:
+            self._fetch_executor = ThreadPoolExecutor(
+                max_workers=max(1, BLOG_FETCH_CONCURRENCY),
+                thread_name_prefix="blog-fetch",
             )
-            return True
 
-        except ClientError as e:
-            logger.error(f"Failed to upload blog post {slug} via S3: {e}")
-            # Fallback to Supabase Storage API
+        def fetch(slug: str) -> Optional[CachedBlogPost]:
             try:
-                response = self._supabase.storage.from_(self._bucket_name).upload(
-                    f"blog_posts/{slug}.md",
+                return self.get_blog_post(slug)
+            except Exception as e:
+                logger.error(f"Failed to fetch blog post {slug}: {e}")
+                return None
+
+        results = self._fetch_executor.map(fetch, slugs)
+        return [post for post in results if post is not None]
+
+    def _cache_blog_post(
+        self, slug: str, content: Optional[str], etag: Optional[str]
+    ) -> Optional[CachedBlogPost]:
+        """Parse blog post content and store it in the cache"""
+        if not content:
+            self._blog_cache.pop(slug)
+            return None
+
+        body = self.strip_frontmatter(content)
+        post = CachedBlogPost(
+            slug=slug,
+            content=content,
+            metadata=self.summarize_blog_post(
+                self.parse_blog_post_metadata(content), body
+            ),
+            body=body,
+            etag=etag,
+            validated_at=time.monotonic(),
+        )
+        self._blog_cache.set(slug, post)
+        return post
+
+    def invalidate_blog_post(self, slug: str):
+        """Drop a blog post from the in-process cache"""
+        self._blog_cache.pop(slug)
+
+    def head_blog_post(self, slug: str) -> Optional[ObjectInfo]:
+        """Return the size and ETag of a blog post without downloading it"""
+        return self._call_storage(
+            f"head blog post {slug}",
+            lambda storage: storage.head(self._blog_key(slug)),
+        )
+
+    def upload_blog_post(
+        self,
+        slug: str,
+        content: str,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> Optional[str]:
+        """Upload blog post to Supabase Storage and return its new ETag.
+
+        if_match / if_none_match make the write conditional; PreconditionFailed
+        is raised if they don't hold. Returns None if the upload failed.
+        """
+        try:
+            etag = self._call_storage(
+                f"upload blog post {slug}",
+                lambda storage: storage.put(
+                    self._blog_key(slug),
                     content.encode("utf-8"),
-                    file_options={"content-type": "text/markdown"},
-                )
-                return response is not None
-            except Exception as fallback_e:
-                logger.error(f"Fallback to Supabase API also failed: {fallback_e}")
-                return False
+                    content_type="text/markdown",
+                    if_match=if_match,
+                    if_none_match=if_none_match,
+                ),
+            )
+            body = self.strip_frontmatter(content)
+            metadata = self.summarize_blog_post(
+                self.parse_blog_post_metadata(content), body
+            )
+            self._search_index.add(slug, metadata, body, etag)
+            self._set_blog_post_summary(slug, {"etag": etag, "metadata": metadata})
+            return etag or ""
+        except PreconditionFailed:
+            raise
         except Exception as e:
             logger.error(f"Failed to upload blog post {slug}: {e}")
-            return False
+            return None
+        finally:
+            self.invalidate_blog_post(slug)
+            self._key_index.invalidate()
 
     def delete_blog_post(self, slug: str) -> bool:
         """Delete blog post from Supabase Storage"""
         try:
-            self.initialize()
-
-            if not self._s3_client:
-                # Fallback to Supabase Storage API
-                response = self._supabase.storage.from_(self._bucket_name).remove(
-                    [f"blog_posts/{slug}.md"]
-                )
-                return len(response) > 0
-
-            # Use S3 API
-            self._s3_client.delete_object(
-                Bucket=self._bucket_name, Key=f"blog_posts/{slug}.md"
+            deleted = self._call_storage(
+                f"delete blog post {slug}",
+                lambda storage: storage.delete(self._blog_key(slug)),
             )
-            return True
-
-        except ClientError as e:
-            logger.error(f"Failed to delete blog post {slug} via S3: {e}")
-            # Fallback to Supabase Storage API
-            try:
-                response = self._supabase.storage.from_(self._bucket_name).remove(
-                    [f"blog_posts/{slug}.md"]
-                )
-                return len(response) > 0
-            except Exception as fallback_e:
-                logger.error(f"Fallback to Supabase API also failed: {fallback_e}")
-                return False
+            self._search_index.remove(slug)
+            self._set_blog_post_summary(slug, None)
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete blog post {slug}: {e}")
             return False
+        finally:
+            self.invalidate_blog_post(slug)
+            self._key_index.invalidate()
+
+    @staticmethod
+    def summarize_blog_post(metadata: Dict[str, str], body: str) -> Dict[str, Any]:
+        """Merge a post's frontmatter with its excerpt, word count, reading
+        time and outline, using the values stored at publish time if present"""
+        summary = parse_summary_fields(metadata) or summarize_post(body)
+        frontmatter = {k: v for k, v in metadata.items() if k not in SUMMARY_FIELDS}
+        return {**frontmatter, **summary}
+
+    def get_blog_post_summaries(self) -> List[Dict[str, Any]]:
+        """Return the metadata and summary of every post, without bodies.
+
+        Served from the manifest stored next to the posts. Once per
+        BLOG_CACHE_TTL_SECONDS it is checked against the bucket listing, and
+        only posts whose ETag changed (e.g. edited outside the API) are
+        downloaded and summarized again.
+        """
+        with self._summaries_lock:
+            self._refresh_summaries_if_due()
+            return [
+                {**entry["metadata"], "slug": slug}
+                for slug, entry in self._summaries.items()
+            ]
+
+    def get_blog_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Return the manifest entry (ETag and metadata) of every post"""
+        with self._summaries_lock:
+            self._refresh_summaries_if_due()
+            return dict(self._summaries)
+
+    def get_blog_post_summary(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest entry of a post: its ETag and metadata"""
+        with self._summaries_lock:
+            self._refresh_summaries_if_due()
+            return self._summaries.get(slug)
+
+    def _refresh_summaries_if_due(self):
+        due = (
+            self._summaries_checked_at is None
+            or time.monotonic() - self._summaries_checked_at >= BLOG_CACHE_TTL_SECONDS
+        )
+        if due:
+            self._refresh_summaries()
+
+    def _refresh_summaries(self):
+        listed = {
+            self._blog_key_to_slug(obj["key"]): obj.get("etag")
+            for obj in self.iter_blog_post_keys(include_details=True)
+        }
+        manifest, manifest_etag = self._load_manifest()
+
+        summaries = {
+            slug: entry
+            for slug, entry in manifest.items()
+            if slug in listed and listed[slug] and entry.get("etag") == listed[slug]
+        }
+        stale = [slug for slug in listed if slug not in summaries]
+        for post in self.get_blog_posts(stale):
+            summaries[post.slug] = {
+                "etag": listed[post.slug],
+                "metadata": post.metadata,
+            }
+
+        self._summaries = summaries
+        self._summaries_checked_at = time.monotonic()
+
+        if summaries != manifest:
+            try:
+                self._save_manifest(summaries, manifest_etag)
+            except PreconditionFailed:
+                # Another worker saved it first; the next refresh reconciles
+                pass
+            except Exception as e:
+                logger.error(f"Failed to save blog manifest: {e}")
+
+    def _set_blog_post_summary(self, slug: str, entry: Optional[Dict[str, Any]]):
+        """Record a written or deleted post in memory and in the manifest"""
+        with self._summaries_lock:
+            if entry is None:
+                self._summaries.pop(slug, None)
+            else:
+                self._summaries[slug] = entry
+
+        for _ in range(BLOG_MANIFEST_WRITE_ATTEMPTS):
+            try:
+                manifest, manifest_etag = self._load_manifest()
+                if entry is None:
+                    manifest.pop(slug, None)
+                else:
+                    manifest[slug] = entry
+                self._save_manifest(manifest, manifest_etag)
+                return
+            except PreconditionFailed:
+                continue  # Lost a race with another writer; reload and retry
+            except Exception as e:
+                logger.error(f"Failed to update blog manifest for {slug}: {e}")
+                return
+        logger.warning(f"Gave up updating blog manifest for {slug}")
+
+    def _load_manifest(self) -> tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        try:
+            response = self.storage.get(BLOG_MANIFEST_KEY)
+        except ObjectNotFound:
+            return {}, None
+
+        try:
+            return json.loads(response.read()), response.etag
+        except ValueError as e:
+            logger.error(f"Ignoring unreadable blog manifest: {e}")
+            return {}, response.etag
+
+    def _save_manifest(
+        self, manifest: Dict[str, Dict[str, Any]], manifest_etag: Optional[str]
+    ):
+        """Write the manifest, only if nobody changed it since it was read"""
+        data = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+        try:
+            self.storage.put(
+                BLOG_MANIFEST_KEY,
+                data,
+                content_type="application/json",
+                if_match=manifest_etag,
+                if_none_match=None if manifest_etag else "*",
+            )
+        except StorageError as e:
+            if type(e) is not StorageError:
+                raise
+            # Storage without conditional writes: last writer wins, and the
+            # periodic refresh repairs any lost update
+            logger.warning(f"Conditional manifest write failed, retrying: {e}")
+            self.storage.put(BLOG_MANIFEST_KEY, data, content_type="application/json")
+
+    def search_blog_posts(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Full-text search over blog posts, ranked with BM25"""
+        self.sync_search_index()
+        return self._search_index.search(query, limit)
+
+    def sync_search_index(self, force: bool = False):
+        """Bring the search index in line with storage if it is due.
+
+        Only posts whose ETag changed since they were indexed are downloaded,
+        and posts that disappeared from storage are dropped.
+        """
+        with self._search_sync_lock:
+            due = (
+                force
+                or self._search_synced_at is None
+                or time.monotonic() - self._search_synced_at
+                >= SEARCH_INDEX_SYNC_SECONDS
+            )
+            if not due:
+                return
+
+            listed = {
+                self._blog_key_to_slug(obj["key"]): obj.get("etag")
+                for obj in self.iter_blog_post_keys(include_details=True)
+            }
+            indexed = self._search_index.versions()
+
+            for slug in indexed.keys() - listed.keys():
+                self._search_index.remove(slug)
+
+            changed = [
+                slug
+                for slug, etag in listed.items()
+                if etag is None or indexed.get(slug) != etag
+            ]
+            for post in self.get_blog_posts(changed):
+                self._search_index.add(
+                    post.slug, post.metadata, post.body, listed[post.slug]
+                )
+
+            self._search_synced_at = time.monotonic()
+
+    def warm_up_blog(self) -> int:
+        """Load the blog summaries and search index; returns the post count"""
+        summaries = self.get_blog_post_summaries()
+        self.sync_search_index(force=True)
+        return len(summaries)
+
+    def get_object(
+        self,
+        key: str,
+        byte_range: Optional[ByteRange] = None,
+        if_match: Optional[str] = None,
+        if_unmodified_since: Optional[datetime] = None,
+    ) -> ObjectResponse:
+        """Open an object in the bucket for reading, optionally ranged.
+
+        The returned response holds an open body; callers are responsible for
+        reading and closing it.
+        """
+        return self.storage.get(
+            key,
+            byte_range=byte_range,
+            if_match=if_match,
+            if_unmodified_since=if_unmodified_since,
+        )
+
+    def get_presigned_url(
+        self, key: str, content_disposition: Optional[str] = None
+    ) -> Optional[tuple[str, float]]:
+        """Return a presigned GET URL for key and the seconds it stays usable.
+
+        URLs are cached until PRESIGNED_URL_REFRESH_MARGIN_SECONDS before they
+        expire, so repeated requests for the same file reuse one signature.
+        Returns None when the storage backend cannot presign URLs.
+        """
+        cache_key = (key, content_disposition)
+        cached = self._presigned_urls.get(cache_key)
+        if cached:
+            url, usable_until = cached
+            return url, usable_until - time.monotonic()
+
+        url = self.storage.presigned_url(
+            key, PRESIGNED_URL_TTL_SECONDS, content_disposition
+        )
+        if url is None:
+            return None
+
+        usable_for = max(
+            PRESIGNED_URL_TTL_SECONDS - PRESIGNED_URL_REFRESH_MARGIN_SECONDS, 0
+        )
+        self._presigned_urls.set(
+            cache_key, (url, time.monotonic() + usable_for), ttl_seconds=usable_for
+        )
+        return url, usable_for
+
+    def head_object(self, key: str) -> Optional[ObjectInfo]:
+        """Return object metadata (size, ETag, last modified) or None if missing"""
+        return self.storage.head(key)
+
+    def get_storage_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-operation S3 latency counters for this process"""
+        return storage_latency.snapshot()
 
     def parse_blog_post_metadata(self, content: str) -> Dict[str, str]:
         """Parse frontmatter metadata from blog post content"""
@@ -267,6 +709,14 @@ class SupabaseService:
             logger.error(f"Failed to parse metadata: {e}")
             return {}
 
+    def strip_frontmatter(self, content: str) -> str:
+        """Return blog post content without its frontmatter block"""
+        if content.startswith("---"):
+            end_index = content.find("---", 3)
+            if end_index != -1:
+                return content[end_index + 3 :].strip()
+        return content
+
 
 # Global instance
 supabase_service = SupabaseService()
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Warm connections, clients and caches before the worker takes traffic. Can be
+# turned off for local runs without a database or storage.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+# A warmup step: a name and a blocking function to run in a worker thread
+WarmupPhase = Tuple[str, Callable[[], Any]]
+
+
+@dataclass
+class PhaseResult:
+    seconds: float
+    ok: bool
+    detail: Optional[Any] = None
+    error: Optional[str] = None
+
+
+class WarmupState:
+    """Readiness of this worker and how long each startup phase took"""
+
+    def __init__(self):
+        self.ready = False
+        self.phases: Dict[str, PhaseResult] = {}
+        self.total_seconds: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "total_seconds": self.total_seconds,
+            "phases": {name: asdict(result) for name, result in self.phases.items()},
+        }
+
+
+warmup_state = WarmupState()
+
+
+def _run_phase(name: str, func: Callable[[], Any]):
+    start = time.perf_counter()
+    try:
+        detail = func()
+        result = PhaseResult(
+            seconds=round(time.perf_counter() - start, 4),
+            ok=True,
+            detail=detail if isinstance(detail, (int, float, str)) else None,
+        )
+        logger.info(f"Warmup {name}: {result.seconds * 1000:.0f} ms")
+    except Exception as e:
+        # A failed phase only means the first real request pays for it
+        result = PhaseResult(
+            seconds=round(time.perf_counter() - start, 4), ok=False, error=str(e)
+        )
+        logger.warning(
+            f"Warmup {name} failed after {result.seconds * 1000:.0f} ms: {e}"
+        )
+    warmup_state.phases[name] = result
+
+
+async def run_warmup(chains: List[List[WarmupPhase]]):
+    """Run warmup phases and mark the worker ready.
+
+    Phases within a chain run in order, since later ones depend on earlier
+    ones (e.g. caches need the connection pool); chains run concurrently.
+    """
+    start = time.perf_counter()
+
+    async def run_chain(chain: List[WarmupPhase]):
+        for name, func in chain:
+            await asyncio.to_thread(_run_phase, name, func)
+
+    await asyncio.gather(*(run_chain(chain) for chain in chains))
+
+    warmup_state.total_seconds = round(time.perf_counter() - start, 4)
+    warmup_state.ready = True
+    logger.info(f"Warmup finished in {warmup_state.total_seconds * 1000:.0f} ms")
@@ -0,0 +1,94 @@
+"""Add gym_daily_stats table
+
+Revision ID: c4d2e8f1a9b7
+Revises: b11314634d95
+Create Date: 2026-10-18 10:12:41.508113
+
+"""
+from alembic import op
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e8f1a9b7'
+down_revision: Union[str, None] = 'b11314634d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # One row per user and day with that day's gym_activity totals. The API
+    # keeps it current on every activity write; the rows are a cache and can
+    # be rebuilt from gym_activity at any time.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS dradic_tech.gym_daily_stats (
+            user_id VARCHAR NOT NULL REFERENCES dradic_tech.users(id) ON DELETE CASCADE,
+            day DATE NOT NULL,
+            activities INTEGER NOT NULL DEFAULT 0,
+            sets INTEGER NOT NULL DEFAULT 0,
+            reps INTEGER NOT NULL DEFAULT 0,
+            tonnage FLOAT NOT NULL DEFAULT 0,
+            muscle_volume JSONB NOT NULL DEFAULT '{}'::jsonb,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (user_id, day)
+        );
+    """)
+
+    # Refreshing a day scans that user's activities for the day
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_dradic_tech_gym_activity_user_id_created_at
+        ON dradic_tech.gym_activity (user_id, created_at);
+    """)
+
+    # Enable Row Level Security
+    op.execute("""
+        ALTER TABLE dradic_tech.gym_daily_stats ENABLE ROW LEVEL SECURITY;
+    """)
+
+    op.execute("""
+        CREATE POLICY "Users can view their own gym daily stats" ON dradic_tech.gym_daily_stats
+        FOR SELECT USING (user_id = auth.uid()::text);
+    """)
+
+    # Backfill from existing activities
+    op.execute("""
+        WITH activity AS (
+            SELECT
+                ga.user_id,
+                DATE(ga.created_at) AS day,
+                ga.sets,
+                ga.reps,
+                ga.weight,
+                e.muscles_trained
+            FROM dradic_tech.gym_activity ga
+            JOIN dradic_tech.exercises e ON ga.exercise_id = e.id
+        ),
+        muscles AS (
+            SELECT a.user_id, a.day, m.key AS muscle,
+                SUM(a.sets * a.reps * m.value::numeric / 100) AS volume
+            FROM activity a
+            CROSS JOIN LATERAL jsonb_each(a.muscles_trained) m
+            GROUP BY a.user_id, a.day, m.key
+        )
+        INSERT INTO dradic_tech.gym_daily_stats
+            (user_id, day, activities, sets, reps, tonnage, muscle_volume)
+        SELECT
+            a.user_id,
+            a.day,
+            COUNT(*),
+            SUM(a.sets),
+            SUM(a.sets * a.reps),
+            SUM(a.sets * a.reps * COALESCE(a.weight, 0)),
+            COALESCE((
+                SELECT jsonb_object_agg(m.muscle, m.volume)
+                FROM muscles m
+                WHERE m.user_id = a.user_id AND m.day = a.day
+            ), '{}'::jsonb)
+        FROM activity a
+        GROUP BY a.user_id, a.day
+        ON CONFLICT (user_id, day) DO NOTHING;
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS dradic_tech.gym_daily_stats CASCADE;")
+    op.execute("DROP INDEX IF EXISTS dradic_tech.ix_dradic_tech_gym_activity_user_id_created_at;")
@@ -0,0 +1,112 @@
+"""Add personal_records table
+
+Revision ID: d7a1c3e5b9f2
+Revises: c4d2e8f1a9b7
+Create Date: 2026-10-18 14:37:05.219846
+
+"""
+from alembic import op
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a1c3e5b9f2'
+down_revision: Union[str, None] = 'c4d2e8f1a9b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Best weighted set per user and exercise, by weight, by estimated one-rep
+    # max and by set volume (reps * weight), each with the activity that set it
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS dradic_tech.personal_records (
+            user_id VARCHAR NOT NULL REFERENCES dradic_tech.users(id) ON DELETE CASCADE,
+            exercise_id UUID NOT NULL REFERENCES dradic_tech.exercises(id) ON DELETE CASCADE,
+            best_weight FLOAT NOT NULL,
+            best_weight_reps FLOAT NOT NULL,
+            best_weight_activity_id UUID NOT NULL,
+            best_weight_at TIMESTAMPTZ NOT NULL,
+            best_one_rep_max FLOAT NOT NULL,
+            best_one_rep_max_activity_id UUID NOT NULL,
+            best_one_rep_max_at TIMESTAMPTZ NOT NULL,
+            best_set_volume FLOAT NOT NULL,
+            best_set_volume_activity_id UUID NOT NULL,
+            best_set_volume_at TIMESTAMPTZ NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (user_id, exercise_id)
+        );
+    """)
+
+    # Recomputing an exercise's records reads its activities for one user
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_dradic_tech_gym_activity_user_id_exercise_id
+        ON dradic_tech.gym_activity (user_id, exercise_id);
+    """)
+
+    # Enable Row Level Security
+    op.execute("""
+        ALTER TABLE dradic_tech.personal_records ENABLE ROW LEVEL SECURITY;
+    """)
+
+    op.execute("""
+        CREATE POLICY "Users can view their own personal records" ON dradic_tech.personal_records
+        FOR SELECT USING (user_id = auth.uid()::text);
+    """)
+
+    # Backfill from existing weighted activities. The estimate must match
+    # estimate_one_rep_max in utils/personal_records.py: Brzycki up to 10 reps,
+    # Epley above (they agree at 10); ties go to the earliest activity.
+    op.execute("""
+        WITH weighted AS (
+            SELECT
+                ga.user_id,
+                ga.exercise_id,
+                ga.id,
+                ga.reps,
+                ga.weight,
+                ga.created_at,
+                CASE
+                    WHEN ga.reps <= 1 THEN ga.weight
+                    WHEN ga.reps <= 10 THEN ga.weight * 36.0 / (37 - ga.reps)
+                    ELSE ga.weight * (1 + ga.reps / 30.0)
+                END AS one_rep_max,
+                ga.reps * ga.weight AS set_volume
+            FROM dradic_tech.gym_activity ga
+            WHERE ga.weight IS NOT NULL
+        ),
+        by_weight AS (
+            SELECT DISTINCT ON (user_id, exercise_id) *
+            FROM weighted
+            ORDER BY user_id, exercise_id, weight DESC, created_at
+        ),
+        by_one_rep_max AS (
+            SELECT DISTINCT ON (user_id, exercise_id) *
+            FROM weighted
+            ORDER BY user_id, exercise_id, one_rep_max DESC, created_at
+        ),
+        by_set_volume AS (
+            SELECT DISTINCT ON (user_id, exercise_id) *
+            FROM weighted
+            ORDER BY user_id, exercise_id, set_volume DESC, created_at
+        )
+        INSERT INTO dradic_tech.personal_records (
+            user_id, exercise_id,
+            best_weight, best_weight_reps, best_weight_activity_id, best_weight_at,
+            best_one_rep_max, best_one_rep_max_activity_id, best_one_rep_max_at,
+            best_set_volume, best_set_volume_activity_id, best_set_volume_at
+        )
+        SELECT
+            w.user_id, w.exercise_id,
+            w.weight, w.reps, w.id, w.created_at,
+            o.one_rep_max, o.id, o.created_at,
+            v.set_volume, v.id, v.created_at
+        FROM by_weight w
+        JOIN by_one_rep_max o USING (user_id, exercise_id)
+        JOIN by_set_volume v USING (user_id, exercise_id)
+        ON CONFLICT (user_id, exercise_id) DO NOTHING;
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS dradic_tech.personal_records CASCADE;")
+    op.execute("DROP INDEX IF EXISTS dradic_tech.ix_dradic_tech_gym_activity_user_id_exercise_id;")